@@ -2,54 +2,207 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from functools import partial
+import importlib
 import logging
+from pathlib import Path
+import time
+from typing import TYPE_CHECKING, Any
 
-from toshiba_ac.device_manager import ToshibaAcDeviceManager
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.const import ATTR_DEVICE_ID, EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .changes import ToshibaAcChangeTracker
+from .command_buffer import ToshibaAcCommandBuffer
+from .const import (
+    CONF_COMMAND_BUFFER,
+    CONF_COMMAND_BUFFER_TTL,
+    CONF_RECORD_MESSAGES,
+    CONF_TRACE_SAMPLE_RATE,
+    CONNECT_RETRY_DELAY,
+    CONNECT_RETRY_MAX_DELAY,
+    DATA_CHANGE_SEQUENCES,
+    DATA_CHANGE_TRACKERS,
+    DATA_COMMAND_BUFFERS,
+    DATA_CONNECT_TASKS,
+    DATA_CONNECTION_STATES,
+    DATA_HTTP_API_HANDOFF,
+    DATA_LIFECYCLE_STATS,
+    DATA_MESSAGE_RECORDER,
+    DATA_STATE_WRITE_STATS,
+    DATA_TRACE_WRITER,
+    DATA_TRACERS,
+    DATA_WATCHDOG_STATS,
+    DEFAULT_COMMAND_BUFFER_TTL,
+    DEVICE_CACHE_SAVE_DELAY,
+    DEVICE_REFRESH_INTERVAL,
+    DOMAIN,
+    ENERGY_REPORT_PERIOD,
+    EVENT_DEVICE_CHANGED,
+    MESSAGE_LOG_FILE_NAME,
+    SHUTDOWN_TIMEOUT,
+    SIGNAL_CONNECTION_STATE_CHANGED,
+    SIGNAL_DEVICE_CHANGED,
+    SIGNAL_DEVICES_ADDED,
+    SIGNAL_DEVICES_REMOVED,
+    STORAGE_VERSION,
+    TRACE_FILE_NAME,
+    ToshibaAcConnectionState,
+)
+from .lifecycle import ToshibaAcLifecycleStats
+from .message_log import ToshibaAcMessageRecorder
+from .tracing import ToshibaAcTracer, ToshibaAcTraceWriter
+from .watchdog import ToshibaAcPushWatchdog, ToshibaAcWatchdogStats
+from .websocket import async_setup as async_setup_websocket
+
+if TYPE_CHECKING:
+    from toshiba_ac.device import ToshibaAcDevice
+
+    from .device_manager import ToshibaAcHassDeviceManager
+    from .energy_report import ToshibaAcEnergyReport
 
 PLATFORMS = ["climate", "select", "sensor", "switch"]
 
+ATTR_COMMAND = "command"
+ATTR_END = "end"
+ATTR_FILE = "file"
+ATTR_START = "start"
+ATTR_VALUE = "value"
+
+SEND_COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_COMMAND): cv.string,
+        vol.Required(ATTR_VALUE): cv.string,
+    }
+)
+
+ENERGY_REPORT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_FILE): cv.string,
+    }
+)
+
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Toshiba AC component."""
     hass.data.setdefault(DOMAIN, {})
+    hass.data.setdefault(DATA_COMMAND_BUFFERS, {})
+
+    async def async_shutdown(_event: Event) -> None:
+        """Shut down all device managers at once when Home Assistant stops."""
+        device_managers: list[ToshibaAcHassDeviceManager] = list(
+            hass.data[DOMAIN].values()
+        )
+        if not device_managers:
+            return
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                device_manager.async_shutdown(SHUTDOWN_TIMEOUT)
+                for device_manager in device_managers
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.warning("Error while shutting down device manager: %s", result)
+        _LOGGER.info(
+            "Shut down %d Toshiba AC connection(s) in %.3f seconds",
+            len(device_managers),
+            time.perf_counter() - started,
+        )
+        if (trace_writer := hass.data.get(DATA_TRACE_WRITER)) is not None:
+            await trace_writer.async_flush()
+        if (message_recorder := hass.data.get(DATA_MESSAGE_RECORDER)) is not None:
+            await message_recorder.async_flush()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_shutdown)
+    async_setup_websocket(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Toshiba AC from a config entry."""
-    device_manager = ToshibaAcDeviceManager(
+    setup_started = time.perf_counter()
+    # The cloud SDK stack is heavy, keep it out of the bootstrap and the event loop
+    await hass.async_add_import_executor_job(
+        importlib.import_module, f"{__name__}.device_manager"
+    )
+    from .device_manager import (  # pylint: disable=import-outside-toplevel
+        ToshibaAcHassDeviceManager,
+    )
+
+    device_manager = ToshibaAcHassDeviceManager(
         entry.data["username"],
         entry.data["password"],
         entry.data["device_id"],
         entry.data.get("sas_token"),
+        # Reuse the session the config flow just logged in with, if any
+        http_api=hass.data.get(DATA_HTTP_API_HANDOFF, {}).pop(
+            entry.data["device_id"], None
+        ),
+        session=async_get_clientsession(hass),
     )
 
-    try:
-        new_sas_token = await device_manager.connect()
-        # Save updated SAS token if we got a new one
-        if new_sas_token and new_sas_token != entry.data.get("sas_token"):
-            _LOGGER.info("SAS token updated during connection")
-            new_data = {**entry.data, "sas_token": new_sas_token}
-            hass.config_entries.async_update_entry(entry, data=new_data)
-    except Exception as ex:
-        error_str = str(ex).lower()
-        # Check for authentication-related errors
-        if "401" in error_str or "403" in error_str or "auth" in error_str:
-            raise ConfigEntryAuthFailed(
-                f"Authentication failed: {ex}. Please reconfigure the integration."
-            ) from ex
-        # For other errors, let HA retry with exponential backoff
-        raise ConfigEntryNotReady(
-            f"Failed to connect to Toshiba AC service: {ex}"
-        ) from ex
+    if entry.options.get(CONF_RECORD_MESSAGES, False):
+        if (message_recorder := hass.data.get(DATA_MESSAGE_RECORDER)) is None:
+            message_recorder = hass.data[
+                DATA_MESSAGE_RECORDER
+            ] = ToshibaAcMessageRecorder(hass, hass.config.path(MESSAGE_LOG_FILE_NAME))
+        device_manager.message_recorder = message_recorder
+        entry.async_on_unload(message_recorder.async_flush)
+
+    connection_states: dict[str, ToshibaAcConnectionState] = hass.data.setdefault(
+        DATA_CONNECTION_STATES, {}
+    )
+
+    def connection_state_changed(state: ToshibaAcConnectionState) -> None:
+        """Push connection state changes to all entities of this entry."""
+        connection_states[device_manager.device_id] = state
+        async_dispatcher_send(
+            hass, f"{SIGNAL_CONNECTION_STATE_CHANGED}_{device_manager.device_id}", state
+        )
+
+    device_manager.on_connection_state_changed_callback.add(connection_state_changed)
+
+    # Entities of the devices seen last time exist right away, the cloud
+    # connection is set up in the background
+    store = _async_device_store(hass, entry)
+    if (cache := await store.async_load()) is not None:
+        device_manager.add_cached_devices(cache["devices"])
+
+    # Unload callbacks run last to first, so this runs after all other cleanup
+    entry.async_on_unload(
+        partial(_async_lifecycle_stats(hass, entry).check_leaks, device_manager)
+    )
 
     # Set up SAS token update callback
     async def sas_token_updated(new_sas_token: str) -> None:
@@ -63,15 +216,257 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Store device manager
     hass.data[DOMAIN][entry.entry_id] = device_manager
 
+    change_tracker = ToshibaAcChangeTracker(
+        hass.data.setdefault(DATA_CHANGE_SEQUENCES, {})
+    )
+    hass.data.setdefault(DATA_CHANGE_TRACKERS, {})[entry.entry_id] = change_tracker
+    entry.async_on_unload(change_tracker.remove_all)
+    entry.async_on_unload(
+        change_tracker.add_listener(partial(_async_fire_device_changed, hass))
+    )
+    for device in device_manager.devices.values():
+        change_tracker.add_device(device)
+
+    tracer: ToshibaAcTracer | None = None
+    if sample_rate := entry.options.get(CONF_TRACE_SAMPLE_RATE, 0):
+        if (trace_writer := hass.data.get(DATA_TRACE_WRITER)) is None:
+            trace_writer = hass.data[DATA_TRACE_WRITER] = ToshibaAcTraceWriter(
+                hass, hass.config.path(TRACE_FILE_NAME)
+            )
+        tracer = ToshibaAcTracer(trace_writer, sample_rate / 100)
+        for device in device_manager.devices.values():
+            tracer.add_device(device)
+        hass.data.setdefault(DATA_TRACERS, {})[device_manager.device_id] = tracer
+        # Unload callbacks run last in first out, so the spans closed by
+        # remove_all are written by the flush
+        entry.async_on_unload(trace_writer.async_flush)
+        entry.async_on_unload(tracer.remove_all)
+
     # Register reconnect service (once per domain)
     await _async_register_services(hass)
 
     # Forward setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if entry.options.get(CONF_COMMAND_BUFFER, False):
+        _async_setup_command_buffers(hass, entry, list(device_manager.devices.values()))
+        _async_setup_command_replay(hass, entry, device_manager)
+
+    async def async_sync_devices() -> None:
+        """Sync the units with the Toshiba account and cache them."""
+        added, removed = await device_manager.async_refresh_devices()
+        store.async_delay_save(
+            lambda: {"devices": device_manager.device_cache()},
+            DEVICE_CACHE_SAVE_DELAY,
+        )
+
+        if removed:
+            async_dispatcher_send(
+                hass, f"{SIGNAL_DEVICES_REMOVED}_{entry.entry_id}", removed
+            )
+            _async_remove_devices(hass, entry, removed)
+            for device in removed:
+                change_tracker.remove_device(device)
+                if tracer is not None:
+                    tracer.remove_device(device)
+        if added:
+            for device in added:
+                change_tracker.add_device(device)
+                if tracer is not None:
+                    tracer.add_device(device)
+            if entry.options.get(CONF_COMMAND_BUFFER, False):
+                _async_setup_command_buffers(hass, entry, added)
+            async_dispatcher_send(
+                hass, f"{SIGNAL_DEVICES_ADDED}_{entry.entry_id}", added
+            )
+
+    connect_task = entry.async_create_background_task(
+        hass,
+        _async_connect(hass, entry, device_manager, async_sync_devices),
+        f"{DOMAIN} connect",
+    )
+    hass.data.setdefault(DATA_CONNECT_TASKS, {})[entry.entry_id] = connect_task
+
+    async def async_refresh_devices(_now: datetime) -> None:
+        """Pick up units added to or removed from the Toshiba account."""
+        if not connect_task.done():
+            # Still connecting, the devices are synced once connected
+            return
+        try:
+            await async_sync_devices()
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.warning("Refreshing the device list failed: %s", ex)
+
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            async_refresh_devices,
+            DEVICE_REFRESH_INTERVAL,
+            name=f"{DOMAIN} device refresh",
+        )
+    )
+    watchdog_stats = hass.data.setdefault(DATA_WATCHDOG_STATS, {}).setdefault(
+        entry.entry_id, ToshibaAcWatchdogStats()
+    )
+    entry.async_on_unload(
+        ToshibaAcPushWatchdog(hass, entry, device_manager, watchdog_stats).async_start()
+    )
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    _async_lifecycle_stats(hass, entry).setup.add(time.perf_counter() - setup_started)
     return True
 
 
+async def _async_connect(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    device_manager: ToshibaAcHassDeviceManager,
+    async_sync_devices: Callable[[], Awaitable[None]],
+) -> None:
+    """Connect to the Toshiba cloud and sync the devices, retrying until done."""
+    delay = CONNECT_RETRY_DELAY
+    while True:
+        try:
+            if device_manager.amqp_api is None:
+                new_sas_token = await device_manager.connect()
+                # Save updated SAS token if we got a new one
+                if new_sas_token and new_sas_token != entry.data.get("sas_token"):
+                    _LOGGER.info("SAS token updated during connection")
+                    new_data = {**entry.data, "sas_token": new_sas_token}
+                    hass.config_entries.async_update_entry(entry, data=new_data)
+            await async_sync_devices()
+        except Exception as ex:  # pylint: disable=broad-except
+            error_str = str(ex).lower()
+            # Check for authentication-related errors
+            if "401" in error_str or "403" in error_str or "auth" in error_str:
+                _LOGGER.error(
+                    "Authentication failed: %s. Please reconfigure the integration",
+                    ex,
+                )
+                entry.async_start_reauth(hass)
+                return
+            _LOGGER.warning(
+                "Failed to connect to Toshiba AC service, retrying in %d seconds: %s",
+                delay,
+                ex,
+            )
+        else:
+            return
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, CONNECT_RETRY_MAX_DELAY)
+
+
+@callback
+def _async_device_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store caching the devices of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+
+
+@callback
+def _async_fire_device_changed(
+    hass: HomeAssistant,
+    device: ToshibaAcDevice,
+    sequence: int,
+    changes: dict[str, Any],
+) -> None:
+    """Publish the fields of a device that changed with a push."""
+    async_dispatcher_send(hass, SIGNAL_DEVICE_CHANGED, device, sequence, changes)
+    device_entry = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, device.ac_unique_id)}
+    )
+    hass.bus.async_fire(
+        EVENT_DEVICE_CHANGED,
+        {
+            "device_id": device_entry.id if device_entry else None,
+            "name": device.name,
+            "sequence": sequence,
+            "changes": changes,
+        },
+    )
+
+
+@callback
+def _async_lifecycle_stats(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> ToshibaAcLifecycleStats:
+    """Return the lifecycle stats of a config entry."""
+    return hass.data.setdefault(DATA_LIFECYCLE_STATS, {}).setdefault(
+        entry.entry_id, ToshibaAcLifecycleStats()
+    )
+
+
+@callback
+def _async_remove_devices(
+    hass: HomeAssistant, entry: ConfigEntry, devices: list[ToshibaAcDevice]
+) -> None:
+    """Remove devices that are gone from the account, together with their entities."""
+    device_registry = dr.async_get(hass)
+    for device in devices:
+        hass.data[DATA_COMMAND_BUFFERS].pop(device.ac_unique_id, None)
+        hass.data.get(DATA_STATE_WRITE_STATS, {}).pop(device.ac_unique_id, None)
+        device_entry = device_registry.async_get_device(
+            identifiers={(DOMAIN, device.ac_unique_id)}
+        )
+        if device_entry is not None:
+            device_registry.async_update_device(
+                device_entry.id, remove_config_entry_id=entry.entry_id
+            )
+
+
+@callback
+def _async_setup_command_buffers(
+    hass: HomeAssistant, entry: ConfigEntry, devices: list[ToshibaAcDevice]
+) -> None:
+    """Create the command buffers of the devices."""
+    ttl = entry.options.get(CONF_COMMAND_BUFFER_TTL, DEFAULT_COMMAND_BUFFER_TTL)
+    command_buffers: dict[str, ToshibaAcCommandBuffer] = hass.data.setdefault(
+        DATA_COMMAND_BUFFERS, {}
+    )
+
+    for device in devices:
+        # Buffers are kept across reloads so commands survive a reconnect
+        command_buffer = command_buffers.setdefault(
+            device.ac_unique_id, ToshibaAcCommandBuffer(ttl)
+        )
+        command_buffer.ttl = ttl
+
+
+@callback
+def _async_setup_command_replay(
+    hass: HomeAssistant, entry: ConfigEntry, device_manager: ToshibaAcHassDeviceManager
+) -> None:
+    """Replay the buffered commands of the units whenever the cloud link is back."""
+
+    @callback
+    def replay_command_buffers(state: ToshibaAcConnectionState) -> None:
+        """Replay the buffered commands once connected."""
+        if state != ToshibaAcConnectionState.CONNECTED:
+            return
+        command_buffers: dict[str, ToshibaAcCommandBuffer] = hass.data[
+            DATA_COMMAND_BUFFERS
+        ]
+        for device in device_manager.devices.values():
+            if (command_buffer := command_buffers.get(device.ac_unique_id)) is not None:
+                entry.async_create_background_task(
+                    hass,
+                    command_buffer.async_replay(device),
+                    f"{DOMAIN} command replay",
+                )
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            f"{SIGNAL_CONNECTION_STATE_CHANGED}_{device_manager.device_id}",
+            replay_command_buffers,
+        )
+    )
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def _async_register_services(hass: HomeAssistant) -> None:
     """Register integration services."""
     if hass.services.has_service(DOMAIN, "reconnect"):
@@ -86,18 +481,181 @@ async def _async_register_services(hass: HomeAssistant) -> None:
 
     hass.services.async_register(DOMAIN, "reconnect", handle_reconnect)
 
+    async def handle_send_command(call: ServiceCall) -> None:
+        """Send a command to units, buffering it while their cloud link is down."""
+        # Loaded with the first config entry, before the services are registered
+        from .device_manager import (  # pylint: disable=import-outside-toplevel
+            parse_command_value,
+        )
+
+        command = call.data[ATTR_COMMAND]
+        try:
+            value = parse_command_value(command, call.data[ATTR_VALUE])
+        except ValueError as ex:
+            raise ServiceValidationError(f"Invalid {command}: {ex}") from ex
+
+        for device_manager, device in _async_devices_by_id(
+            hass, call.data[ATTR_DEVICE_ID]
+        ):
+            try:
+                await device_manager.async_send_command(
+                    device,
+                    f"set_ac_{command}",
+                    value,
+                    hass.data[DATA_COMMAND_BUFFERS].get(device.ac_unique_id),
+                )
+            except Exception as ex:
+                raise HomeAssistantError(
+                    f"Sending {command} to {device.name} failed: {ex}"
+                ) from ex
+
+    hass.services.async_register(
+        DOMAIN, "send_command", handle_send_command, schema=SEND_COMMAND_SCHEMA
+    )
+
+    async def handle_energy_report(call: ServiceCall) -> ServiceResponse:
+        """Report the energy use of all units, as response and/or CSV file."""
+        if ATTR_FILE not in call.data and not call.return_response:
+            raise ServiceValidationError(
+                "Set a file or ask for a response to get the energy report"
+            )
+        end = dt_util.as_utc(
+            dt_util.as_local(call.data[ATTR_END])
+            if ATTR_END in call.data
+            else dt_util.utcnow()
+        )
+        start = dt_util.as_utc(
+            dt_util.as_local(call.data[ATTR_START])
+            if ATTR_START in call.data
+            else end - ENERGY_REPORT_PERIOD
+        )
+        if start >= end:
+            raise ServiceValidationError("The start must be before the end")
+
+        energy_report = await hass.async_add_import_executor_job(
+            importlib.import_module, f"{__name__}.energy_report"
+        )
+        units = energy_report.async_get_report_units(
+            hass, list(hass.data[DOMAIN].values())
+        )
+        if not units:
+            raise ServiceValidationError("No Toshiba AC energy sensor found")
+        started = time.perf_counter()
+        report: ToshibaAcEnergyReport = await energy_report.async_energy_report(
+            hass, units, start, end
+        )
+
+        if ATTR_FILE in call.data:
+            path = Path(hass.config.path(call.data[ATTR_FILE]))
+            try:
+                await hass.async_add_executor_job(
+                    _write_energy_report, Path(hass.config.config_dir), path, report
+                )
+            except (OSError, ValueError) as ex:
+                raise HomeAssistantError(f"Writing {path} failed: {ex}") from ex
+
+        summary = (
+            await hass.async_add_executor_job(report.summary)
+            if call.return_response
+            else None
+        )
+        _LOGGER.debug(
+            "Energy report of %d units over %d hours took %.3f seconds",
+            len(units),
+            report.hours.size,
+            time.perf_counter() - started,
+        )
+        return summary
+
+    hass.services.async_register(
+        DOMAIN,
+        "energy_report",
+        handle_energy_report,
+        schema=ENERGY_REPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def _async_devices_by_id(
+    hass: HomeAssistant, device_ids: list[str]
+) -> list[tuple[ToshibaAcHassDeviceManager, ToshibaAcDevice]]:
+    """Return the units of device registry entries with their device managers."""
+    device_registry = dr.async_get(hass)
+    device_managers: list[ToshibaAcHassDeviceManager] = list(hass.data[DOMAIN].values())
+    devices = []
+    for device_id in device_ids:
+        device_entry = device_registry.async_get(device_id)
+        ac_unique_ids = (
+            {value for domain, value in device_entry.identifiers if domain == DOMAIN}
+            if device_entry is not None
+            else set()
+        )
+        for device_manager in device_managers:
+            if ac_unique_id := ac_unique_ids & device_manager.devices.keys():
+                devices.append(
+                    (device_manager, device_manager.devices[ac_unique_id.pop()])
+                )
+                break
+        else:
+            raise ServiceValidationError(f"{device_id} is not a loaded Toshiba AC unit")
+    return devices
+
+
+def _write_energy_report(
+    config_dir: Path, path: Path, report: ToshibaAcEnergyReport
+) -> None:
+    """Write an energy report as CSV file into the configuration directory."""
+    if not path.resolve().is_relative_to(config_dir.resolve()):
+        raise ValueError("the file must be in the configuration directory")
+    report.write_csv(str(path))
+
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.info("Unloading Toshiba AC integration")
+    unload_started = time.perf_counter()
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        device_manager: ToshibaAcDeviceManager = hass.data[DOMAIN].pop(entry.entry_id)
+        device_manager: ToshibaAcHassDeviceManager = hass.data[DOMAIN].pop(
+            entry.entry_id
+        )
+        if not entry.options.get(CONF_COMMAND_BUFFER, False):
+            for ac_unique_id in device_manager.devices:
+                hass.data[DATA_COMMAND_BUFFERS].pop(ac_unique_id, None)
+        hass.data[DATA_CONNECTION_STATES].pop(device_manager.device_id, None)
+        hass.data[DATA_CHANGE_TRACKERS].pop(entry.entry_id, None)
+        hass.data.get(DATA_TRACERS, {}).pop(device_manager.device_id, None)
+        hass.data[DATA_CONNECT_TASKS].pop(entry.entry_id).cancel()
+        if device_manager.devices_info:
+            # Keep the latest state of the devices for the next setup
+            await _async_device_store(hass, entry).async_save(
+                {"devices": device_manager.device_cache()}
+            )
         try:
-            await device_manager.shutdown()
+            await device_manager.async_shutdown(SHUTDOWN_TIMEOUT)
         except Exception as ex:
             _LOGGER.warning("Error while shutting down device manager: %s", ex)
 
+        _async_lifecycle_stats(hass, entry).unload.add(
+            time.perf_counter() - unload_started
+        )
+
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the device cache and the statistics of a config entry."""
+    await _async_device_store(hass, entry).async_remove()
+    # The devices are still registered, they are removed after this
+    write_stats = hass.data.get(DATA_STATE_WRITE_STATS, {})
+    for device_entry in dr.async_entries_for_config_entry(
+        dr.async_get(hass), entry.entry_id
+    ):
+        for domain, ac_unique_id in device_entry.identifiers:
+            if domain == DOMAIN:
+                write_stats.pop(ac_unique_id, None)
+    hass.data.get(DATA_WATCHDOG_STATS, {}).pop(entry.entry_id, None)
+    hass.data.get(DATA_LIFECYCLE_STATS, {}).pop(entry.entry_id, None)
@@ -0,0 +1,128 @@
+"""Track which fields of Toshiba AC devices changed with each push."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from enum import Enum
+import logging
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from toshiba_ac.device import ToshibaAcDevice
+
+    ToshibaAcChangeListener = Callable[[ToshibaAcDevice, int, dict[str, Any]], None]
+
+_LOGGER = logging.getLogger(__name__)
+
+DEVICE_FIELDS = (
+    "ac_status",
+    "ac_mode",
+    "ac_temperature",
+    "ac_fan_mode",
+    "ac_swing_mode",
+    "ac_power_selection",
+    "ac_merit_a",
+    "ac_merit_b",
+    "ac_air_pure_ion",
+    "ac_self_cleaning",
+    "ac_indoor_temperature",
+    "ac_outdoor_temperature",
+)
+
+SUPPORTED_FIELDS = (
+    "ac_mode",
+    "ac_fan_mode",
+    "ac_swing_mode",
+    "ac_power_selection",
+    "ac_merit_a",
+    "ac_merit_b",
+    "ac_air_pure_ion",
+)
+
+
+def device_field(device: ToshibaAcDevice, field: str) -> Any:
+    """Return a field of the device with enums as lower case names."""
+    value = getattr(device, field)
+    if isinstance(value, Enum):
+        return None if value.value is None else value.name.lower()
+    return value
+
+
+def device_snapshot(device: ToshibaAcDevice) -> dict[str, Any]:
+    """Return all tracked fields of the device."""
+    return {field: device_field(device, field) for field in DEVICE_FIELDS}
+
+
+def device_supported(device: ToshibaAcDevice) -> dict[str, Any]:
+    """Return the supported values of the device as lower case names."""
+    supported: dict[str, Any] = {
+        field: [value.name.lower() for value in getattr(device.supported, field)]
+        for field in SUPPORTED_FIELDS
+    }
+    supported["ac_energy_report"] = device.supported.ac_energy_report
+    return supported
+
+
+class ToshibaAcChangeTracker:
+    """Diff the state of each device once per push and fan out the changes.
+
+    Listeners receive the device, its sequence number and only the fields that
+    changed. Sequence numbers live in a dict passed in by the caller, so they keep
+    increasing across reloads of the config entry.
+    """
+
+    def __init__(self, sequences: dict[str, int]) -> None:
+        """Initialize the tracker."""
+        self._sequences = sequences
+        self._snapshots: dict[str, dict[str, Any]] = {}
+        self._devices: dict[str, ToshibaAcDevice] = {}
+        self._listeners: list[ToshibaAcChangeListener] = []
+
+    def add_device(self, device: ToshibaAcDevice) -> None:
+        """Start tracking a device."""
+        if device.ac_unique_id in self._devices:
+            return
+        self._devices[device.ac_unique_id] = device
+        self._snapshots[device.ac_unique_id] = device_snapshot(device)
+        device.on_state_changed_callback.add(self._device_changed)
+
+    def remove_device(self, device: ToshibaAcDevice) -> None:
+        """Stop tracking a device."""
+        if self._devices.pop(device.ac_unique_id, None) is None:
+            return
+        device.on_state_changed_callback.remove(self._device_changed)
+        del self._snapshots[device.ac_unique_id]
+
+    def remove_all(self) -> None:
+        """Stop tracking all devices."""
+        for device in list(self._devices.values()):
+            self.remove_device(device)
+
+    def add_listener(self, listener: ToshibaAcChangeListener) -> Callable[[], None]:
+        """Call listener with the changes of each push, return a remove function."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def sequence(self, device: ToshibaAcDevice) -> int:
+        """Return the sequence number of the last change of the device."""
+        return self._sequences.get(device.ac_unique_id, 0)
+
+    def _device_changed(self, device: ToshibaAcDevice) -> None:
+        """Diff the device against its previous state."""
+        snapshot = self._snapshots[device.ac_unique_id]
+        changes = {}
+        for field in DEVICE_FIELDS:
+            value = device_field(device, field)
+            if snapshot[field] != value:
+                snapshot[field] = value
+                changes[field] = value
+        if not changes:
+            return
+
+        sequence = self._sequences.get(device.ac_unique_id, 0) + 1
+        self._sequences[device.ac_unique_id] = sequence
+        for listener in list(self._listeners):
+            try:
+                listener(device, sequence, changes)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error in change listener for %s", device.name)
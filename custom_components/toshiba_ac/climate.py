@@ -1,9 +1,8 @@
 """Platform for climate integration."""
 from __future__ import annotations
 
-from collections.abc import Mapping
 import logging
-from typing import Any
+import time
 
 from toshiba_ac.device import (
     ToshibaAcDevice,
@@ -23,11 +22,31 @@ from homeassistant.components.climate.const import (
     ClimateEntityFeature,
     HVACMode,
 )
-from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
+from homeassistant.const import (
+    ATTR_TEMPERATURE,
+    ATTR_UNIT_OF_MEASUREMENT,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfTemperature,
+)
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    State,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util.unit_conversion import TemperatureConverter
 
-from .const import DOMAIN
+from .const import CONF_REMOTE_SENSORS, DOMAIN, SIGNAL_DEVICES_ADDED
 from .entity import ToshibaAcStateEntity
 from .feature_list import get_feature_by_name, get_feature_list
+from .remote_sensor import ToshibaAcTemperatureFollower
+from .tracing import traced
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,21 +60,49 @@ TOSHIBA_TO_HVAC_MODE = {
 
 HVAC_MODE_TO_TOSHIBA = {v: k for k, v in TOSHIBA_TO_HVAC_MODE.items()}
 
+# Modes in which the unit regulates on its setpoint
+FOLLOW_MODES = (
+    ToshibaAcMode.AUTO,
+    ToshibaAcMode.COOL,
+    ToshibaAcMode.HEAT,
+    ToshibaAcMode.DRY,
+)
+# How long a sent setpoint is assumed while waiting for the unit to confirm it
+SETPOINT_CONFIRM_TIMEOUT = 60.0
+
 
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Add climate entities for passed config_entry in HA."""
     device_manager = hass.data[DOMAIN][config_entry.entry_id]
+    remote_sensors = config_entry.options.get(CONF_REMOTE_SENSORS, {})
+
+    @callback
+    def add_entities(devices: list[ToshibaAcDevice]) -> None:
+        """Add climate entities for the given devices."""
+        new_entities = [
+            ToshibaClimate(device, remote_sensors.get(device.ac_unique_id))
+            for device in devices
+        ]
+
+        if new_entities:
+            _LOGGER.info("Adding %d climate entities", len(new_entities))
+            async_add_devices(new_entities)
+
+    add_entities(await device_manager.get_devices())
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{SIGNAL_DEVICES_ADDED}_{config_entry.entry_id}", add_entities
+        )
+    )
 
-    devices = await device_manager.get_devices()
-    new_entities = [ToshibaClimate(device) for device in devices]
-
-    if new_entities:
-        _LOGGER.info("Adding %d climate entities", len(new_entities))
-        async_add_devices(new_entities)
 
+class ToshibaClimate(ToshibaAcStateEntity, ClimateEntity, RestoreEntity):
+    """Provides a Toshiba climates.
 
-class ToshibaClimate(ToshibaAcStateEntity, ClimateEntity):
-    """Provides a Toshiba climates."""
+    With a remote sensor, the current temperature is the one of the room sensor
+    and the target temperature is meant for the room. The setpoint of the unit is
+    corrected by the difference between both sensors, within a command budget.
+    """
 
     # This is the main entity for the device
     _attr_has_entity_name = True
@@ -72,20 +119,236 @@ class ToshibaClimate(ToshibaAcStateEntity, ClimateEntity):
     _attr_target_temperature_step = 1
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
 
-    def __init__(self, toshiba_device: ToshibaAcDevice):
+    def __init__(
+        self, toshiba_device: ToshibaAcDevice, remote_sensor: str | None = None
+    ):
         """Initialize the climate."""
         super().__init__(toshiba_device)
 
+        self._follower = (
+            ToshibaAcTemperatureFollower(remote_sensor, time.monotonic())
+            if remote_sensor
+            else None
+        )
+        self._sent_setpoint: tuple[int, float] | None = None
+        self._follow_retry: CALLBACK_TYPE | None = None
+
         self._enable_turn_on_off_backwards_compatibility = False
         self._attr_unique_id = f"{self._device.ac_unique_id}_climate"
         self._attr_fan_modes = get_feature_list(self._device.supported.ac_fan_mode)
         self._attr_swing_modes = get_feature_list(self._device.supported.ac_swing_mode)
+        self._attr_preset_modes = get_feature_list(
+            self._device.supported.ac_power_selection
+        )
+        self._attr_hvac_modes = [HVACMode.OFF] + [
+            hvac_mode
+            for toshiba_mode, hvac_mode in TOSHIBA_TO_HVAC_MODE.items()
+            if toshiba_mode in self._device.supported.ac_mode
+        ]
+        self.update_attrs()
 
     @property
     def is_on(self):
         """Return True if the device is on or completely off."""
         return self._device.ac_status == ToshibaAcStatus.ON
 
+    async def async_added_to_hass(self) -> None:
+        """Start following the remote sensor, if any."""
+        await super().async_added_to_hass()
+        if (follower := self._follower) is None:
+            return
+
+        last_state = await self.async_get_last_state()
+        if last_state is not None and (
+            temperature := last_state.attributes.get(ATTR_TEMPERATURE)
+        ):
+            follower.requested = float(temperature)
+        else:
+            follower.requested = self._device.ac_temperature
+        self._update_room_temperature(self.hass.states.get(follower.sensor_entity_id))
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass, follower.sensor_entity_id, self._room_temperature_changed
+            )
+        )
+        self.update_attrs()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop retrying a correction."""
+        await super().async_will_remove_from_hass()
+        if self._follow_retry is not None:
+            self._follow_retry()
+            self._follow_retry = None
+
+    def _update_room_temperature(self, state: State | None) -> None:
+        """Take the temperature of the room sensor from its state."""
+        temperature = None
+        if state is not None and state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            try:
+                temperature = TemperatureConverter.convert(
+                    float(state.state),
+                    state.attributes.get(
+                        ATTR_UNIT_OF_MEASUREMENT, UnitOfTemperature.CELSIUS
+                    ),
+                    UnitOfTemperature.CELSIUS,
+                )
+            except (ValueError, HomeAssistantError):
+                _LOGGER.warning(
+                    "Room sensor %s has no usable temperature: %s",
+                    state.entity_id,
+                    state.state,
+                )
+        self._follower.room_temperature = temperature
+
+    @callback
+    def _room_temperature_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Correct the setpoint when the room temperature changes."""
+        self._update_room_temperature(event.data["new_state"])
+        self.update_attrs()
+        self.async_write_ha_state()
+        self._async_follow()
+
+    @callback
+    def _flush_state(self) -> None:
+        """Write the state and correct the setpoint for the new unit state."""
+        super()._flush_state()
+        self._async_follow()
+
+    def _unit_setpoint(self, now: float) -> int | None:
+        """Return the setpoint of the unit, or the one sent and not confirmed yet."""
+        if self._sent_setpoint is not None:
+            setpoint, sent = self._sent_setpoint
+            if (
+                self._device.ac_temperature != setpoint
+                and now - sent < SETPOINT_CONFIRM_TIMEOUT
+            ):
+                return setpoint
+            self._sent_setpoint = None
+        return self._device.ac_temperature
+
+    @callback
+    def _async_follow(self) -> None:
+        """Send a corrected setpoint in the background if one is due."""
+        if (setpoint := self._async_due_setpoint()) is not None:
+            # Cancelled with the config entry, not left running after an unload
+            self.platform.config_entry.async_create_background_task(
+                self.hass,
+                self._async_send_correction(setpoint),
+                f"{DOMAIN} setpoint correction",
+            )
+
+    async def _async_send_correction(self, setpoint: int) -> None:
+        """Send a corrected setpoint in the background, logging a failure."""
+        try:
+            await self._async_send_setpoint(setpoint)
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.warning(
+                "Correcting the setpoint of %s to %s failed: %s",
+                self._device.name,
+                setpoint,
+                ex,
+            )
+
+    async def _async_send_setpoint(self, setpoint: int) -> None:
+        """Send a corrected setpoint, it is no longer assumed if sending fails."""
+        try:
+            await self.async_send_command("set_ac_temperature", setpoint)
+        except Exception:
+            if self._sent_setpoint is not None and self._sent_setpoint[0] == setpoint:
+                self._sent_setpoint = None
+            raise
+
+    @callback
+    def _async_due_setpoint(self, force: bool = False) -> int | None:
+        """Return the corrected setpoint if one is due and the budget allows it."""
+        if (follower := self._follower) is None or not self.available:
+            return None
+        if not self.is_on or self._device.ac_mode not in FOLLOW_MODES:
+            return None
+
+        now = time.monotonic()
+        setpoint = follower.setpoint(
+            self._device.ac_indoor_temperature,
+            self._unit_setpoint(now),
+            self.min_temp,
+            self.max_temp,
+            force,
+        )
+        if setpoint is None:
+            return None
+        # A requested temperature is sent right away, but still uses the budget
+        if not follower.budget.try_consume(now) and not force:
+            if self._follow_retry is None:
+                self._follow_retry = async_call_later(
+                    self.hass,
+                    follower.budget.seconds_until_available(now),
+                    self._async_retry_follow,
+                )
+            return None
+
+        _LOGGER.debug(
+            "Correcting setpoint of %s to %s for room temperature %s",
+            self._device.name,
+            setpoint,
+            follower.room_temperature,
+        )
+        self._sent_setpoint = (setpoint, now)
+        return setpoint
+
+    @callback
+    def _async_retry_follow(self, _now) -> None:
+        """Correct the setpoint once the budget allows it again."""
+        self._follow_retry = None
+        self._async_follow()
+
+    def update_attrs(self) -> None:
+        """Compute the state once per device state change."""
+        device = self._device
+        is_on = device.ac_status == ToshibaAcStatus.ON
+
+        self._attr_hvac_mode = (
+            TOSHIBA_TO_HVAC_MODE.get(device.ac_mode) if is_on else HVACMode.OFF
+        )
+        if device.ac_self_cleaning == ToshibaAcSelfCleaning.ON:
+            self._attr_preset_mode = "cleaning"
+        elif is_on:
+            self._attr_preset_mode = pretty_enum_name(device.ac_power_selection)
+        else:
+            self._attr_preset_mode = None
+        self._attr_fan_mode = pretty_enum_name(device.ac_fan_mode)
+        self._attr_swing_mode = pretty_enum_name(device.ac_swing_mode)
+        self._attr_current_temperature = device.ac_indoor_temperature
+        self._attr_target_temperature = device.ac_temperature
+        follower = self._follower
+        if follower is not None:
+            if follower.room_temperature is not None:
+                self._attr_current_temperature = follower.room_temperature
+            if follower.requested is not None:
+                self._attr_target_temperature = follower.requested
+
+        if device.ac_merit_a == ToshibaAcMeritA.HEATING_8C:
+            self._attr_min_temp, self._attr_max_temp = 5, 13
+        else:
+            self._attr_min_temp, self._attr_max_temp = 17, 30
+
+        self._attr_extra_state_attributes = {
+            "merit_a_feature": device.ac_merit_a.name,
+            "merit_b_feature": device.ac_merit_b.name,
+            "air_pure_ion": device.ac_air_pure_ion.name,
+            "self_cleaning": device.ac_self_cleaning.name,
+            "outdoor_temperature": device.ac_outdoor_temperature,
+        }
+        if follower is not None:
+            self._attr_extra_state_attributes.update(
+                {
+                    "remote_sensor": follower.sensor_entity_id,
+                    "unit_temperature": device.ac_indoor_temperature,
+                    "unit_setpoint": device.ac_temperature,
+                    "setpoint_offset": follower.offset(device.ac_indoor_temperature),
+                }
+            )
+
+    @traced
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
         set_temperature = kwargs[ATTR_TEMPERATURE]
@@ -109,39 +372,27 @@ class ToshibaClimate(ToshibaAcStateEntity, ClimateEntity):
             elif set_temperature < 17:
                 set_temperature = 17
 
-        await self._device.set_ac_temperature(set_temperature)
-
-    # PRESET MODE / POWER SETTING
-
-    @property
-    def preset_mode(self) -> str | None:
-        """Return the current preset mode, e.g., home, away, temp.
-
-        Requires SUPPORT_PRESET_MODE.
-        """
-        if self._device.ac_self_cleaning == ToshibaAcSelfCleaning.ON:
-            return "cleaning"
+        if self._follower is not None:
+            self._follower.requested = set_temperature
+            self.update_attrs()
+            self.async_write_ha_state()
+            if (setpoint := self._async_due_setpoint(force=True)) is not None:
+                await self._async_send_setpoint(setpoint)
+            return
 
-        if not self.is_on:
-            return None
+        await self.async_send_command("set_ac_temperature", set_temperature)
 
-        return pretty_enum_name(self._device.ac_power_selection)
-
-    @property
-    def preset_modes(self) -> list[str] | None:
-        """Return a list of available preset modes.
-
-        Requires SUPPORT_PRESET_MODE.
-        """
-        return get_feature_list(self._device.supported.ac_power_selection)
+    # PRESET MODE / POWER SETTING
 
+    @traced
     async def async_turn_on(self) -> None:
         """Turn device on."""
-        await self._device.set_ac_status(ToshibaAcStatus.ON)
+        await self.async_send_command("set_ac_status", ToshibaAcStatus.ON)
 
+    @traced
     async def async_turn_off(self) -> None:
         """Turn device off."""
-        await self._device.set_ac_status(ToshibaAcStatus.OFF)
+        await self.async_send_command("set_ac_status", ToshibaAcStatus.OFF)
 
     async def async_toggle(self) -> None:
         """Toggle device status."""
@@ -151,6 +402,7 @@ class ToshibaClimate(ToshibaAcStateEntity, ClimateEntity):
         else:
             await self.async_turn_off()
 
+    @traced
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set new preset mode."""
         _LOGGER.info("Toshiba Climate setting preset_mode: %s", preset_mode)
@@ -159,107 +411,40 @@ class ToshibaClimate(ToshibaAcStateEntity, ClimateEntity):
             list(ToshibaAcPowerSelection), preset_mode
         )
         if feature_list_id is not None:
-            await self._device.set_ac_power_selection(feature_list_id)
-
-    @property
-    def hvac_mode(self) -> HVACMode | str | None:
-        """Return hvac operation ie. heat, cool mode."""
-        if not self.is_on:
-            return HVACMode.OFF
-
-        return TOSHIBA_TO_HVAC_MODE[self._device.ac_mode]
-
-    @property
-    def hvac_modes(self) -> list[HVACMode] | list[str]:
-        """Return the list of available hvac operation modes."""
-        available_modes = [HVACMode.OFF]
-        for toshiba_mode, hvac_mode in TOSHIBA_TO_HVAC_MODE.items():
-            if toshiba_mode in self._device.supported.ac_mode:
-                available_modes.append(hvac_mode)
-        return available_modes
+            await self.async_send_command("set_ac_power_selection", feature_list_id)
 
+    @traced
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
         _LOGGER.info("Toshiba Climate setting hvac_mode: %s", hvac_mode)
 
         if hvac_mode == HVACMode.OFF:
-            await self._device.set_ac_status(ToshibaAcStatus.OFF)
+            await self.async_send_command("set_ac_status", ToshibaAcStatus.OFF)
         else:
             if not self.is_on:
-                await self._device.set_ac_status(ToshibaAcStatus.ON)
-            await self._device.set_ac_mode(HVAC_MODE_TO_TOSHIBA[hvac_mode])
+                await self.async_send_command("set_ac_status", ToshibaAcStatus.ON)
+            await self.async_send_command(
+                "set_ac_mode", HVAC_MODE_TO_TOSHIBA[hvac_mode]
+            )
 
+    @traced
     async def async_set_fan_mode(self, fan_mode):
         """Set new target fan mode."""
         _LOGGER.info("Toshiba Climate setting fan_mode: %s", fan_mode)
         if fan_mode == FAN_OFF:
-            await self._device.set_ac_fan_mode(ToshibaAcStatus.OFF)
+            await self.async_send_command("set_ac_fan_mode", ToshibaAcStatus.OFF)
         else:
             if not self.is_on:
-                await self._device.set_ac_status(ToshibaAcStatus.ON)
+                await self.async_send_command("set_ac_status", ToshibaAcStatus.ON)
             fan_mode = fan_mode.title().replace("_", " ")
             feature_list_id = get_feature_by_name(list(ToshibaAcFanMode), fan_mode)
             if feature_list_id is not None:
-                await self._device.set_ac_fan_mode(feature_list_id)
-
-    @property
-    def fan_mode(self) -> str | None:
-        """Return the fan setting."""
-        return pretty_enum_name(self._device.ac_fan_mode)
+                await self.async_send_command("set_ac_fan_mode", feature_list_id)
 
+    @traced
     async def async_set_swing_mode(self, swing_mode: str) -> None:
         """Set new target swing operation."""
         swing_mode = swing_mode.title().replace("_", " ")
         feature_list_id = get_feature_by_name(list(ToshibaAcSwingMode), swing_mode)
         if feature_list_id is not None:
-            await self._device.set_ac_swing_mode(feature_list_id)
-
-    @property
-    def swing_mode(self) -> str | None:
-        """Return the swing setting."""
-        return pretty_enum_name(self._device.ac_swing_mode)
-
-    @property
-    def current_temperature(self) -> float | None:
-        """Return the current temperature."""
-        return self._device.ac_indoor_temperature
-
-    @property
-    def target_temperature(self) -> float | None:
-        """Return the temperature we try to reach."""
-        return self._device.ac_temperature
-
-    @property
-    def min_temp(self) -> float:
-        """Return the minimum temperature."""
-        if (
-            hasattr(self._device, "ac_merit_a")
-            and self._device.ac_merit_a == ToshibaAcMeritA.HEATING_8C
-        ):
-            return 5
-        return 17
-
-    @property
-    def max_temp(self) -> float:
-        """Return the maximum temperature."""
-        if (
-            hasattr(self._device, "ac_merit_a")
-            and self._device.ac_merit_a == ToshibaAcMeritA.HEATING_8C
-        ):
-            return 13
-        return 30
-
-    @property
-    def extra_state_attributes(self) -> Mapping[str, Any]:
-        """Return entity specific state attributes.
-
-        Implemented by platform classes. Convention for attribute names
-        is lowercase snake_case.
-        """
-        return {
-            "merit_a_feature": self._device.ac_merit_a.name,
-            "merit_b_feature": self._device.ac_merit_b.name,
-            "air_pure_ion": self._device.ac_air_pure_ion.name,
-            "self_cleaning": self._device.ac_self_cleaning.name,
-            "outdoor_temperature": self._device.ac_outdoor_temperature,
-        }
+            await self.async_send_command("set_ac_swing_mode", feature_list_id)
@@ -0,0 +1,104 @@
+"""Buffer commands for Toshiba AC devices while the cloud link is down."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from .const import COMMAND_BUFFER_MAX_SIZE
+
+if TYPE_CHECKING:
+    from toshiba_ac.device import ToshibaAcDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ToshibaAcCommandBuffer:
+    """Hold the latest pending command per setter of a single AC device.
+
+    Commands for the same setter collapse into one entry which moves to the end of
+    the queue, so replay happens in the order the surviving commands were issued.
+    A command the device rejects is dropped, a connection error stops the replay
+    and keeps the remaining commands.
+    """
+
+    def __init__(self, ttl: float, max_size: int = COMMAND_BUFFER_MAX_SIZE) -> None:
+        """Initialize the buffer."""
+        self.ttl = ttl
+        self.max_size = max_size
+        self._commands: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of pending commands."""
+        return len(self._commands)
+
+    def add(self, setter: str, value: Any) -> None:
+        """Queue a command, replacing any pending command for the same setter."""
+        self._commands.pop(setter, None)
+        self._commands[setter] = (value, time.monotonic() + self.ttl)
+        while len(self._commands) > self.max_size:
+            dropped, _ = self._commands.popitem(last=False)
+            _LOGGER.warning("Command buffer full, dropping pending %s", dropped)
+
+    def discard(self, setter: str) -> None:
+        """Drop the pending command for a setter, superseded by a delivered one."""
+        self._commands.pop(setter, None)
+
+    def clear(self) -> None:
+        """Drop all pending commands."""
+        self._commands.clear()
+
+    async def async_replay(self, device: ToshibaAcDevice) -> None:
+        """Send all pending commands that have not expired yet."""
+        if not self._commands or self._lock.locked():
+            return
+
+        # Loaded with the device manager, before anything is replayed
+        from toshiba_ac.device import (  # pylint: disable=import-outside-toplevel
+            ToshibaAcDeviceError,
+        )
+
+        async with self._lock:
+            while self._commands:
+                setter, (value, expires_at) = next(iter(self._commands.items()))
+                if expires_at < time.monotonic():
+                    _LOGGER.info(
+                        "AC device %s dropping expired command %s", device.name, setter
+                    )
+                    del self._commands[setter]
+                    continue
+
+                _LOGGER.info(
+                    "AC device %s replaying buffered %s %s", device.name, setter, value
+                )
+                try:
+                    await getattr(device, setter)(value)
+                except ToshibaAcDeviceError as ex:
+                    # The unit rejects it, replaying it again would not help
+                    _LOGGER.warning(
+                        "AC device %s dropping buffered %s %s: %s",
+                        device.name,
+                        setter,
+                        value,
+                        ex,
+                    )
+                    if self._commands.get(setter, (None, None))[1] == expires_at:
+                        del self._commands[setter]
+                    continue
+                except Exception as ex:  # pylint: disable=broad-except
+                    _LOGGER.warning(
+                        "AC device %s replay of %s failed, keeping %d command(s): %s",
+                        device.name,
+                        setter,
+                        len(self._commands),
+                        ex,
+                    )
+                    return
+
+                # A newer command for the same setter may have arrived while sending
+                if self._commands.get(setter, (None, None))[1] == expires_at:
+                    del self._commands[setter]
@@ -1,20 +1,32 @@
 """Config flow for Toshiba AC integration."""
 from __future__ import annotations
 
+import importlib
 import logging
 import random
 from typing import Any
 
-from toshiba_ac.device_manager import ToshibaAcDeviceManager
-from toshiba_ac.utils.http_api import ToshibaAcHttpApiAuthError, ToshibaAcHttpApiError
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN, SensorDeviceClass
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
-
-from .const import DOMAIN
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import EntitySelector, EntitySelectorConfig
+
+from .const import (
+    CONF_COMMAND_BUFFER,
+    CONF_COMMAND_BUFFER_TTL,
+    CONF_FLEET_SENSORS,
+    CONF_RECORD_MESSAGES,
+    CONF_REMOTE_SENSORS,
+    CONF_TRACE_SAMPLE_RATE,
+    DATA_HTTP_API_HANDOFF,
+    DEFAULT_COMMAND_BUFFER_TTL,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,17 +43,32 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
+    # Only the HTTP API is used, but it loads the library's device package and
+    # with it the Azure SDK, so it is imported in the executor
+    await hass.async_add_import_executor_job(
+        importlib.import_module, f"{__package__}.http_api"
+    )
+    # pylint: disable=import-outside-toplevel
+    from toshiba_ac.utils.http_api import (
+        ToshibaAcHttpApiAuthError,
+        ToshibaAcHttpApiError,
+    )
+
+    from .http_api import ToshibaAcHassHttpApi
+
     device_id = f"{random.getrandbits(64):016x}"
 
     _LOGGER.debug("Toshiba validate input %s %s", data["username"], device_id)
 
-    device_manager = ToshibaAcDeviceManager(
-        data["username"], data["password"], device_id
+    http_api = ToshibaAcHassHttpApi(
+        data["username"], data["password"], async_get_clientsession(hass)
     )
+    sas_token: str | None = None
 
     try:
-        sas_token = await device_manager.connect()
-
+        await http_api.connect()
+        # Same client id as ToshibaAcDeviceManager registers with
+        sas_token = await http_api.register_client(f"{data['username']}_{device_id}")
     except ToshibaAcHttpApiAuthError as ex:
         _LOGGER.error("Toshiba connection error %s", ex)
         raise InvalidAuth from ex
@@ -49,8 +76,13 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         _LOGGER.error("Toshiba connection error %s", ex)
         raise CannotConnect from ex
     finally:
-        _LOGGER.error("Toshiba connection OK")
-        await device_manager.shutdown()
+        if sas_token is None:
+            await http_api.shutdown()
+
+    _LOGGER.debug("Toshiba connection OK")
+
+    # Hand the logged in session over to the first setup of the new entry
+    hass.data.setdefault(DATA_HTTP_API_HANDOFF, {})[device_id] = http_api
 
     return {
         "username": data["username"],
@@ -65,6 +97,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -93,6 +133,106 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Toshiba AC options."""
+
+    def __init__(self) -> None:
+        """Initialize the options flow."""
+        self._options: dict[str, Any] = {}
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            self._options = {**self.config_entry.options, **user_input}
+            if self._device_names():
+                return await self.async_step_remote_sensors()
+            return self.async_create_entry(title="", data=self._options)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_COMMAND_BUFFER,
+                        default=options.get(CONF_COMMAND_BUFFER, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_COMMAND_BUFFER_TTL,
+                        default=options.get(
+                            CONF_COMMAND_BUFFER_TTL, DEFAULT_COMMAND_BUFFER_TTL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=86400)),
+                    vol.Optional(
+                        CONF_FLEET_SENSORS,
+                        default=options.get(CONF_FLEET_SENSORS, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_TRACE_SAMPLE_RATE,
+                        default=options.get(CONF_TRACE_SAMPLE_RATE, 0),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                    vol.Optional(
+                        CONF_RECORD_MESSAGES,
+                        default=options.get(CONF_RECORD_MESSAGES, False),
+                    ): bool,
+                }
+            ),
+        )
+
+    async def async_step_remote_sensors(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Bind units to external room temperature sensors."""
+        device_names = self._device_names()
+        if user_input is not None:
+            self._options[CONF_REMOTE_SENSORS] = {
+                ac_unique_id: user_input[ac_unique_id]
+                for ac_unique_id in device_names
+                if user_input.get(ac_unique_id)
+            }
+            return self.async_create_entry(title="", data=self._options)
+
+        remote_sensors = self._options.get(CONF_REMOTE_SENSORS, {})
+        sensor_selector = EntitySelector(
+            EntitySelectorConfig(
+                domain=SENSOR_DOMAIN, device_class=SensorDeviceClass.TEMPERATURE
+            )
+        )
+        return self.async_show_form(
+            step_id="remote_sensors",
+            data_schema=vol.Schema(
+                {
+                    # Names can repeat and change, the fields are keyed by id
+                    vol.Optional(
+                        ac_unique_id,
+                        description={
+                            "suggested_value": remote_sensors.get(ac_unique_id)
+                        },
+                    ): sensor_selector
+                    for ac_unique_id in device_names
+                }
+            ),
+            description_placeholders={
+                "units": "\n".join(
+                    f"- {ac_unique_id}: {name}"
+                    for ac_unique_id, name in device_names.items()
+                )
+            },
+        )
+
+    def _device_names(self) -> dict[str, str]:
+        """Return the names of the units of this entry by ac_unique_id."""
+        device_manager = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if device_manager is None:
+            return {}
+        return {
+            ac_unique_id: device.name
+            for ac_unique_id, device in device_manager.devices.items()
+        }
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
@@ -1,3 +1,97 @@
 """Constants for the Toshiba AC integration."""
 
+from datetime import timedelta
+from enum import StrEnum
+
 DOMAIN = "toshiba_ac"
+
+CONF_COMMAND_BUFFER = "command_buffer"
+CONF_COMMAND_BUFFER_TTL = "command_buffer_ttl"
+CONF_FLEET_SENSORS = "fleet_sensors"
+CONF_TRACE_SAMPLE_RATE = "trace_sample_rate"
+CONF_RECORD_MESSAGES = "record_messages"
+CONF_REMOTE_SENSORS = "remote_sensors"
+
+DEFAULT_COMMAND_BUFFER_TTL = 600
+COMMAND_BUFFER_MAX_SIZE = 16
+
+STATE_WRITE_COALESCE_DELAY = 0.05
+DEVICE_REFRESH_INTERVAL = timedelta(minutes=30)
+SHUTDOWN_TIMEOUT = 10.0
+# How long the SDK client of an abandoned connection may take to shut down
+FORCE_CLOSE_TIMEOUT = 60.0
+CONNECT_RETRY_DELAY = 30.0
+CONNECT_RETRY_MAX_DELAY = 1800.0
+DEVICE_CACHE_SAVE_DELAY = 60.0
+STORAGE_VERSION = 1
+# The library fetches the energy consumption of all devices every 10 minutes
+ENERGY_REPORT_INTERVAL = timedelta(minutes=10)
+POWER_SMOOTHING_TIME_CONSTANT = 1800.0
+ENERGY_REPORT_PERIOD = timedelta(days=30)
+ENERGY_REPORT_PEAK_HOURS = 5
+TEMPERATURE_HISTORY_SIZE = 64
+TEMPERATURE_RATE_WINDOW = timedelta(hours=1)
+TEMPERATURE_RATE_MIN_SAMPLES = 3
+
+REMOTE_SENSOR_COMMAND_BUDGET = 6
+REMOTE_SENSOR_BUDGET_PERIOD = timedelta(hours=1)
+REMOTE_SENSOR_HYSTERESIS = 1.0
+REMOTE_SENSOR_MAX_OFFSET = 5.0
+
+TRACE_FILE_NAME = f"{DOMAIN}_trace.jsonl"
+TRACE_FILE_MAX_BYTES = 5 * 1024 * 1024
+TRACE_FILE_BACKUPS = 2
+TRACE_FLUSH_DELAY = 5.0
+TRACE_CONFIRM_TIMEOUT = 60.0
+TRACE_MAX_PENDING = 16
+
+MESSAGE_LOG_FILE_NAME = f"{DOMAIN}_messages.jsonl.gz"
+MESSAGE_LOG_MAX_BYTES = 20 * 1024 * 1024
+MESSAGE_LOG_FLUSH_DELAY = 5.0
+
+WATCHDOG_CHECK_INTERVAL = timedelta(seconds=30)
+WATCHDOG_MIN_SAMPLES = 5
+WATCHDOG_MIN_SILENCE = timedelta(minutes=5)
+WATCHDOG_SILENCE_FACTOR = 4
+WATCHDOG_PROBE_TIMEOUT = 30.0
+WATCHDOG_PROBE_INTERVAL = timedelta(minutes=5)
+WATCHDOG_RECONNECT_BACKOFF = timedelta(minutes=15)
+
+DATA_COMMAND_BUFFERS = f"{DOMAIN}_command_buffers"
+DATA_STATE_WRITE_STATS = f"{DOMAIN}_state_write_stats"
+DATA_HTTP_API_HANDOFF = f"{DOMAIN}_http_api_handoff"
+DATA_CONNECTION_STATES = f"{DOMAIN}_connection_states"
+DATA_WATCHDOG_STATS = f"{DOMAIN}_watchdog_stats"
+DATA_LIFECYCLE_STATS = f"{DOMAIN}_lifecycle_stats"
+DATA_CHANGE_SEQUENCES = f"{DOMAIN}_change_sequences"
+DATA_CHANGE_TRACKERS = f"{DOMAIN}_change_trackers"
+DATA_CONNECT_TASKS = f"{DOMAIN}_connect_tasks"
+
+DATA_TRACERS = f"{DOMAIN}_tracers"
+DATA_TRACE_WRITER = f"{DOMAIN}_trace_writer"
+DATA_MESSAGE_RECORDER = f"{DOMAIN}_message_recorder"
+
+EVENT_DEVICE_CHANGED = f"{DOMAIN}_device_changed"
+
+SIGNAL_DEVICES_ADDED = f"{DOMAIN}_devices_added"
+SIGNAL_DEVICES_REMOVED = f"{DOMAIN}_devices_removed"
+SIGNAL_DEVICE_CHANGED = f"{DOMAIN}_device_changed"
+SIGNAL_CONNECTION_STATE_CHANGED = f"{DOMAIN}_connection_state_changed"
+
+
+class ToshibaAcConnectionState(StrEnum):
+    """Connection state of a device manager to the Toshiba cloud."""
+
+    CONNECTING = "connecting"
+    CONNECTED = "connected"
+    # Push link is up, but renewing the SAS token failed
+    DEGRADED = "degraded"
+    DISCONNECTED = "disconnected"
+
+    @property
+    def available(self) -> bool:
+        """Return True if entities are available in this state."""
+        return self in (
+            ToshibaAcConnectionState.CONNECTED,
+            ToshibaAcConnectionState.DEGRADED,
+        )
@@ -0,0 +1,696 @@
+"""Device manager used by the Toshiba AC integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable
+from dataclasses import asdict
+from enum import Enum
+import logging
+import struct
+import threading
+import time
+from typing import Any, ClassVar
+
+import aiohttp
+from toshiba_ac.device import ToshibaAcDevice, ToshibaAcDeviceError, properties
+from toshiba_ac.device.fcu_state import ToshibaAcFcuState
+from toshiba_ac.device_manager import (
+    ToshibaAcDeviceManager,
+    ToshibaAcDeviceManagerError,
+)
+from toshiba_ac.utils import ToshibaAcCallback
+from toshiba_ac.utils.amqp_api import ToshibaAcAmqpApi
+from toshiba_ac.utils.http_api import ToshibaAcDeviceInfo, ToshibaAcHttpApi
+
+from .command_buffer import ToshibaAcCommandBuffer
+from .const import FORCE_CLOSE_TIMEOUT, ToshibaAcConnectionState
+from .http_api import ToshibaAcHassHttpApi
+from .message_log import KIND_ENERGY, ToshibaAcMessageRecorder
+from .watchdog import ToshibaAcPushCadence
+
+_LOGGER = logging.getLogger(__name__)
+
+CMD_FCU_FROM_AC = "CMD_FCU_FROM_AC"
+CMD_HEARTBEAT = "CMD_HEARTBEAT"
+
+# Commands of the send_command service, with the enum of their values
+COMMAND_ENUMS: dict[str, type[Enum] | None] = {
+    "status": properties.ToshibaAcStatus,
+    "mode": properties.ToshibaAcMode,
+    "temperature": None,
+    "fan_mode": properties.ToshibaAcFanMode,
+    "swing_mode": properties.ToshibaAcSwingMode,
+    "power_selection": properties.ToshibaAcPowerSelection,
+    "merit_a": properties.ToshibaAcMeritA,
+    "merit_b": properties.ToshibaAcMeritB,
+    "air_pure_ion": properties.ToshibaAcAirPureIon,
+}
+
+
+def parse_command_value(command: str, value: str) -> Any:
+    """Return the value of a command as its setter expects it, raise ValueError."""
+    if command not in COMMAND_ENUMS:
+        raise ValueError(f"not one of {', '.join(COMMAND_ENUMS)}")
+    if (enum := COMMAND_ENUMS[command]) is None:
+        return int(value)
+    try:
+        return enum[value.strip().upper()]
+    except KeyError:
+        raise ValueError(
+            f"{value} is not one of {', '.join(member.name for member in enum)}"
+        ) from None
+
+
+def _shutdown_sdk_client(amqp_api: ToshibaAcAmqpApi) -> None:
+    """Shut down the SDK client on a loop of its own, run in the executor."""
+    asyncio.run(asyncio.wait_for(amqp_api.device.shutdown(), FORCE_CLOSE_TIMEOUT))
+
+
+class ToshibaAcConnectionStateCallback(ToshibaAcCallback[ToshibaAcConnectionState]):
+    """Callbacks called with the new connection state of a device manager."""
+
+
+class ToshibaAcMailbox:
+    """Pending state of a single device, merged from the commands since delivery.
+
+    Commands are merged field by field into one state, newer values replacing
+    older ones, so a burst of commands costs a single update of the device.
+    """
+
+    __slots__ = ("state", "first_received", "last_received", "messages")
+
+    def __init__(self, received: float) -> None:
+        """Initialize an empty mailbox."""
+        self.state = ToshibaAcFcuState()
+        self.first_received = received
+        self.last_received = received
+        self.messages = 0
+
+    def merge(self, command: str, payload: dict[str, Any], received: float) -> None:
+        """Merge a command into the pending state, raise if it is malformed."""
+        if command == CMD_FCU_FROM_AC:
+            if not isinstance(data := payload["data"], str):
+                raise TypeError(f"Malformed AC state {data!r}")
+            self.state.update(data)
+        else:
+            # Same conversion as ToshibaAcDevice.handle_cmd_heartbeat()
+            self.state.update_from_hbt(
+                {
+                    key: struct.unpack(
+                        "b" if "Temp" in key else "B", bytes.fromhex(value)
+                    )[0]
+                    for key, value in payload.items()
+                }
+            )
+        self.last_received = received
+        self.messages += 1
+
+
+class ToshibaAcHassDeviceManager(ToshibaAcDeviceManager):
+    """Toshiba AC device manager with a batched bridge for push messages.
+
+    The library hands every AMQP command from the SDK handler thread to the event
+    loop with run_coroutine_threadsafe() and blocks that thread until all device
+    callbacks have run. Here incoming commands are merged into a mailbox per
+    device instead, and a single wakeup of the event loop delivers the newest
+    state of every device with pending commands. However large a burst is, at
+    most one state per device is pending and delivered.
+
+    An already logged in HTTP API, e.g. from the config flow, can be passed in so
+    that connect() skips the login. Otherwise the login happens on the given
+    aiohttp session, if any, instead of a private session of the library.
+
+    Devices are synced with the cloud by async_refresh_devices(), which picks up
+    units that were added to or removed from the account without reconnecting.
+    Before the first sync, devices can be created from a cache with
+    add_cached_devices(), so that their entities exist while connecting. They
+    are started once the cloud still lists them.
+
+    connection_state follows connect/shutdown, the AMQP client's connection state
+    events and SAS token renewals; changes are reported through
+    on_connection_state_changed_callback.
+
+    push_cadence learns how often each device pushes messages, for the watchdog.
+
+    With a message_recorder set, every command handled by the bridge and every
+    energy report is recorded.
+    """
+
+    # Forced closes of SDK clients in the executor, of all device managers
+    _sdk_closing: ClassVar[set[asyncio.Future[None]]] = set()
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        device_id: str | None = None,
+        sas_token: str | None = None,
+        http_api: ToshibaAcHttpApi | None = None,
+        session: aiohttp.ClientSession | None = None,
+    ) -> None:
+        """Initialize the device manager."""
+        super().__init__(username, password, device_id, sas_token)
+        self.http_api = http_api
+        self._session = session
+        self._mailboxes: dict[str, ToshibaAcMailbox] = {}
+        self._recorded: list[tuple[str, str, dict[str, Any], float]] = []
+        self._drain_lock = threading.Lock()
+        self._drain_scheduled = False
+        self.drain_task: asyncio.Task[None] | None = None
+        self._closing: set[asyncio.Future[None]] = set()
+        self.ingestion_stats: Counter[str] = Counter()
+        self.ingestion_latency_max = 0.0
+        self.ingestion_depth_max = 0
+        self.push_cadence: dict[str, ToshibaAcPushCadence] = {}
+        self.devices_info: dict[str, ToshibaAcDeviceInfo] = {}
+        self.message_recorder: ToshibaAcMessageRecorder | None = None
+        self.connection_state = ToshibaAcConnectionState.DISCONNECTED
+        self._on_connection_state_changed_callback = ToshibaAcConnectionStateCallback()
+
+    async def connect(self) -> str:
+        """Connect to the Toshiba cloud and track the AMQP connection state."""
+        await self._async_set_connection_state(ToshibaAcConnectionState.CONNECTING)
+        try:
+            if self.http_api is None and self._session is not None:
+                http_api = ToshibaAcHassHttpApi(
+                    self.username, self.password, self._session
+                )
+                await http_api.connect()
+                self.http_api = http_api
+            sas_token = await super().connect()
+        except BaseException:
+            await self._async_set_connection_state(
+                ToshibaAcConnectionState.DISCONNECTED
+            )
+            raise
+
+        if self.amqp_api:
+            self.amqp_api.device.on_connection_state_change = (
+                self._amqp_connection_state_changed
+            )
+        for device in self.devices.values():
+            # Cached devices were created before the APIs existed
+            device.amqp_api = self.amqp_api
+            device.http_api = self.http_api
+        await self._async_set_connection_state(ToshibaAcConnectionState.CONNECTED)
+        return sas_token
+
+    async def shutdown(self) -> None:
+        """Shut down all connections concurrently, logging each phase's duration."""
+        try:
+            async with self.lock:
+                phases: list[tuple[str, Awaitable[Any]]] = []
+                for task in (
+                    self.periodic_fetch_energy_consumption_task,
+                    self.drain_task,
+                ):
+                    if task is not None and not task.done():
+                        task.cancel()
+                        phases.append(("background tasks", task))
+                phases.extend(
+                    (f"device {device.name}", device.shutdown())
+                    for device in self.devices.values()
+                )
+                if self.amqp_api:
+                    phases.append(("AMQP", self.amqp_api.shutdown()))
+                if self.http_api:
+                    phases.append(("HTTP", self.http_api.shutdown()))
+
+                try:
+                    results = await asyncio.gather(
+                        *(self._async_timed(name, aw) for name, aw in phases),
+                        return_exceptions=True,
+                    )
+                finally:
+                    self.periodic_fetch_energy_consumption_task = None
+                    self.drain_task = None
+                    self.amqp_api = None
+                    self.http_api = None
+
+                for result in results:
+                    if isinstance(result, Exception):
+                        raise result
+        finally:
+            await self._async_set_connection_state(
+                ToshibaAcConnectionState.DISCONNECTED
+            )
+
+    async def async_shutdown(self, timeout: float) -> None:
+        """Shut down, abandoning the connections if the cloud does not respond."""
+        started = time.perf_counter()
+        amqp_api = self.amqp_api
+        http_api = self.http_api
+        try:
+            async with asyncio.timeout(timeout):
+                await self.shutdown()
+        except TimeoutError:
+            _LOGGER.warning(
+                "Shutdown did not finish within %s seconds, closing connections",
+                timeout,
+            )
+            self._force_close(amqp_api, http_api)
+        finally:
+            _LOGGER.debug("Shutdown took %.3f seconds", time.perf_counter() - started)
+
+    def _force_close(
+        self, amqp_api: ToshibaAcAmqpApi | None, http_api: ToshibaAcHttpApi | None
+    ) -> None:
+        """Drop all connections and tasks without waiting for the cloud."""
+        for device in self.devices.values():
+            if device.periodic_reload_state_task is not None:
+                device.periodic_reload_state_task.cancel()
+        for task in (self.periodic_fetch_energy_consumption_task, self.drain_task):
+            if task is not None:
+                task.cancel()
+        if amqp_api is not None:
+            # Stop handing messages to the event loop while the SDK winds down
+            amqp_api.handlers.clear()
+            # The SDK client shuts down its MQTT threads on a loop of its own in
+            # the executor, so a hanging cloud cannot block the event loop. At
+            # most one such thread waits for the cloud at a time.
+            if self._sdk_closing:
+                _LOGGER.warning(
+                    "An earlier AMQP client is still closing, abandoning this one"
+                )
+            else:
+                future = self.loop.run_in_executor(None, _shutdown_sdk_client, amqp_api)
+                self._sdk_closing.add(future)
+                future.add_done_callback(self._sdk_closing.discard)
+                self._track_closing(future, "AMQP")
+        if http_api is not None:
+            # Closes the session if the library created one, otherwise only
+            # rejects further requests on the shared session
+            self._track_closing(self.loop.create_task(http_api.shutdown()), "HTTP")
+        self.periodic_fetch_energy_consumption_task = None
+        self.drain_task = None
+        self.amqp_api = None
+        self.http_api = None
+        self._mailboxes = {}
+        self._recorded = []
+
+    def _track_closing(self, future: asyncio.Future[None], name: str) -> None:
+        """Keep a reference to a closing connection and log its errors."""
+
+        def done(future: asyncio.Future[None]) -> None:
+            self._closing.discard(future)
+            if not future.cancelled() and (error := future.exception()):
+                _LOGGER.debug("Closing %s failed: %r", name, error)
+
+        self._closing.add(future)
+        future.add_done_callback(done)
+
+    @staticmethod
+    async def _async_timed(name: str, awaitable: Awaitable[Any]) -> None:
+        """Await a shutdown phase and log how long it took."""
+        started = time.perf_counter()
+        try:
+            await awaitable
+        finally:
+            _LOGGER.debug(
+                "Shutdown of %s took %.3f seconds", name, time.perf_counter() - started
+            )
+
+    async def renew_sas_token(self) -> str:
+        """Renew the SAS token, the link is degraded while this fails."""
+        try:
+            sas_token = await super().renew_sas_token()
+        except Exception:
+            if self.connection_state == ToshibaAcConnectionState.CONNECTED:
+                await self._async_set_connection_state(
+                    ToshibaAcConnectionState.DEGRADED
+                )
+            raise
+
+        if self.connection_state == ToshibaAcConnectionState.DEGRADED:
+            await self._async_set_connection_state(ToshibaAcConnectionState.CONNECTED)
+        return sas_token
+
+    async def async_probe_push_link(self, timeout: float) -> None:
+        """Make a round trip over the push connection, raise if it fails.
+
+        Reading the device twin is a request and response over the same MQTT
+        connection to the IoT hub that carries the push messages.
+        """
+        if self.amqp_api is None:
+            raise ToshibaAcDeviceManagerError("Not connected")
+        async with asyncio.timeout(timeout):
+            await self.amqp_api.device.get_twin()
+
+    def _amqp_connection_state_changed(self) -> None:
+        """Handle a connection state change of the AMQP client on the SDK thread."""
+        if self.amqp_api is None:
+            return
+        connected = self.amqp_api.device.connected
+        _LOGGER.info("AMQP connection %s", "up" if connected else "down")
+        state = (
+            ToshibaAcConnectionState.CONNECTED
+            if connected
+            else ToshibaAcConnectionState.DISCONNECTED
+        )
+        asyncio.run_coroutine_threadsafe(
+            self._async_set_connection_state(state), self.loop
+        )
+
+    async def _async_set_connection_state(
+        self, state: ToshibaAcConnectionState
+    ) -> None:
+        """Update the connection state and notify the listeners on a change."""
+        if state == self.connection_state:
+            return
+        _LOGGER.debug("Connection state %s -> %s", self.connection_state, state)
+        self.connection_state = state
+        await self.on_connection_state_changed_callback(state)
+
+    @property
+    def on_connection_state_changed_callback(
+        self,
+    ) -> ToshibaAcConnectionStateCallback:
+        """Return the callbacks called when the connection state changes."""
+        return self._on_connection_state_changed_callback
+
+    def handle_cmd_fcu_from_ac(
+        self,
+        source_id: str,
+        message_id: str,
+        target_id: list[Any],
+        payload: dict[str, Any],
+        timestamp: str,
+    ) -> None:
+        """Queue a state update received on the SDK thread."""
+        self._enqueue(CMD_FCU_FROM_AC, source_id, payload)
+
+    def handle_cmd_heartbeat(
+        self,
+        source_id: str,
+        message_id: str,
+        target_id: list[Any],
+        payload: dict[str, Any],
+        timestamp: str,
+    ) -> None:
+        """Queue a heartbeat received on the SDK thread."""
+        self._enqueue(CMD_HEARTBEAT, source_id, payload)
+
+    def _enqueue(self, command: str, source_id: str, payload: dict[str, Any]) -> None:
+        """Merge a command into the mailbox of its device and wake up the loop."""
+        received = time.monotonic()
+        if source_id not in self.devices:
+            _LOGGER.debug("Ignoring %s for unknown device %s", command, source_id)
+            return
+
+        with self._drain_lock:
+            if self.message_recorder is not None:
+                self._recorded.append((command, source_id, payload, received))
+            if (mailbox := self._mailboxes.get(source_id)) is None:
+                mailbox = self._mailboxes[source_id] = ToshibaAcMailbox(received)
+                self.ingestion_depth_max = max(
+                    self.ingestion_depth_max, len(self._mailboxes)
+                )
+            try:
+                mailbox.merge(command, payload, received)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error handling %s for %s", command, source_id)
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        self.loop.call_soon_threadsafe(self._start_drain)
+
+    def _start_drain(self) -> None:
+        """Start processing queued commands on the event loop."""
+        self.drain_task = self.loop.create_task(self._async_drain())
+
+    async def _async_drain(self) -> None:
+        """Deliver all mailboxes, including those filled meanwhile.
+
+        cpu_total_us only counts the bridge's own work between the awaits, not the
+        device callbacks or other tasks that run while a delivery is awaited.
+        """
+        self.ingestion_stats["wakeups"] += 1
+
+        while True:
+            cpu_start = time.thread_time()
+            with self._drain_lock:
+                mailboxes, self._mailboxes = self._mailboxes, {}
+                recorded, self._recorded = self._recorded, []
+                self._drain_scheduled = bool(mailboxes or recorded)
+
+            if self.message_recorder is not None:
+                for command, source_id, payload, received in recorded:
+                    self.message_recorder.record(command, source_id, payload, received)
+            self._add_cpu_time(cpu_start)
+            if not self._drain_scheduled:
+                break
+
+            for source_id, mailbox in mailboxes.items():
+                if not mailbox.messages:
+                    continue
+                await self._async_deliver(source_id, mailbox)
+                cpu_start = time.thread_time()
+                if (cadence := self.push_cadence.get(source_id)) is not None:
+                    cadence.message_received(mailbox.last_received)
+                elif source_id in self.devices:
+                    self.push_cadence[source_id] = ToshibaAcPushCadence(
+                        mailbox.last_received
+                    )
+                latency = time.monotonic() - mailbox.first_received
+                self.ingestion_stats["messages"] += mailbox.messages
+                self.ingestion_stats["updates"] += 1
+                self.ingestion_stats["dropped"] += mailbox.messages - 1
+                self.ingestion_stats["latency_total_us"] += int(latency * 1e6)
+                self.ingestion_latency_max = max(self.ingestion_latency_max, latency)
+                self._add_cpu_time(cpu_start)
+
+    def _add_cpu_time(self, cpu_start: float) -> None:
+        """Count the CPU time of the event loop thread since cpu_start."""
+        self.ingestion_stats["cpu_total_us"] += int(
+            (time.thread_time() - cpu_start) * 1e6
+        )
+
+    async def _async_deliver(self, source_id: str, mailbox: ToshibaAcMailbox) -> None:
+        """Update a device with the merged state of its mailbox."""
+        if (device := self.devices.get(source_id)) is None:
+            # Removed since the commands arrived
+            return
+
+        try:
+            await device.handle_cmd_fcu_from_ac({"data": mailbox.state.encode()})
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error handling the state update of %s", device.name)
+
+    async def fetch_energy_consumption(self) -> None:
+        """Fetch the energy consumption of all devices, recording the reports."""
+        if not self.http_api:
+            raise ToshibaAcDeviceManagerError("Not connected")
+
+        consumptions = await self.http_api.get_devices_energy_consumption(
+            list(self.devices)
+        )
+        received = time.monotonic()
+        updates = []
+        for ac_unique_id, consumption in consumptions.items():
+            if (device := self.devices.get(ac_unique_id)) is None:
+                continue
+            if self.message_recorder is not None:
+                self.message_recorder.record(
+                    KIND_ENERGY,
+                    ac_unique_id,
+                    {
+                        "wh": consumption.energy_wh,
+                        "since": consumption.since.isoformat(),
+                    },
+                    received,
+                )
+            updates.append(device.handle_update_ac_energy_consumption(consumption))
+        await asyncio.gather(*updates)
+
+    async def async_send_command(
+        self,
+        device: ToshibaAcDevice,
+        setter: str,
+        value: Any,
+        command_buffer: ToshibaAcCommandBuffer | None = None,
+    ) -> bool:
+        """Call a setter of a device, return False if the command was buffered.
+
+        While the cloud link is down, or if sending fails, the command goes into
+        the buffer, to be replayed once connected. Without a buffer it fails.
+        """
+        if self.connection_state.available:
+            try:
+                await getattr(device, setter)(value)
+            except ToshibaAcDeviceError:
+                raise
+            except Exception as ex:
+                if command_buffer is None:
+                    raise
+                _LOGGER.warning(
+                    "AC device %s unreachable, buffering %s %s: %s",
+                    device.name,
+                    setter,
+                    value,
+                    ex,
+                )
+            else:
+                if command_buffer is not None:
+                    command_buffer.discard(setter)
+                return True
+        elif command_buffer is None:
+            raise ToshibaAcDeviceManagerError("Not connected")
+        else:
+            _LOGGER.info(
+                "AC device %s not connected, buffering %s %s",
+                device.name,
+                setter,
+                value,
+            )
+
+        command_buffer.add(setter, value)
+        return False
+
+    async def get_devices(self) -> list[ToshibaAcDevice]:
+        """Return the known devices, including cached ones that are not started."""
+        return list(self.devices.values())
+
+    def add_cached_devices(self, devices: list[dict[str, Any]]) -> None:
+        """Create devices from the cache written from device_cache()."""
+        for data in devices:
+            device_info = ToshibaAcDeviceInfo(**data)
+            self.devices_info[device_info.ac_unique_id] = device_info
+            self.devices[device_info.ac_unique_id] = self._create_device(device_info)
+
+    def device_cache(self) -> list[dict[str, Any]]:
+        """Return the info of all devices with their current state, for caching."""
+        return [
+            {
+                **asdict(device_info),
+                "initial_ac_state": self.devices[ac_unique_id].fcu_state.encode(),
+            }
+            for ac_unique_id, device_info in self.devices_info.items()
+            if ac_unique_id in self.devices
+        ]
+
+    def _create_device(self, device_info: ToshibaAcDeviceInfo) -> ToshibaAcDevice:
+        """Create a device, it still has to be connected."""
+        return ToshibaAcDevice(
+            device_info.ac_name,
+            self.device_id,
+            device_info.ac_id,
+            device_info.ac_unique_id,
+            device_info.initial_ac_state,
+            device_info.firmware_version,
+            device_info.merit_feature,
+            device_info.ac_model_id,
+            self.amqp_api,
+            self.http_api,
+        )
+
+    async def async_refresh_devices(
+        self,
+    ) -> tuple[list[ToshibaAcDevice], list[ToshibaAcDevice]]:
+        """Sync the known devices with the cloud, return the added and removed ones.
+
+        Cached devices that are still listed are started and their state reloaded,
+        they are not part of the added devices. Devices that fail to start are
+        stopped again and retried with the next sync, the others are synced
+        regardless.
+        """
+        if not self.http_api or not self.amqp_api:
+            raise ToshibaAcDeviceManagerError("Not connected")
+
+        async with self.lock:
+            devices_info = await self.http_api.get_devices()
+            self.devices_info = {info.ac_unique_id: info for info in devices_info}
+            known = self.devices_info.keys()
+
+            removed = [
+                device
+                for ac_unique_id, device in self.devices.items()
+                if ac_unique_id not in known
+            ]
+            cached = [
+                device
+                for ac_unique_id, device in self.devices.items()
+                if ac_unique_id in known and device.periodic_reload_state_task is None
+            ]
+            new = [
+                self._create_device(device_info)
+                for device_info in devices_info
+                if device_info.ac_unique_id not in self.devices
+            ]
+
+            results = await asyncio.gather(
+                *(device.connect() for device in new),
+                *(self._async_start_cached(device) for device in cached),
+                return_exceptions=True,
+            )
+            failed = []
+            for device, result in zip([*new, *cached], results, strict=True):
+                if isinstance(result, BaseException):
+                    _LOGGER.warning(
+                        "Starting device %s failed: %s", device.name, result
+                    )
+                    failed.append(device)
+
+            for device in removed:
+                _LOGGER.info("Removing device %s", device.name)
+                del self.devices[device.ac_unique_id]
+                self.push_cadence.pop(device.ac_unique_id, None)
+            added = [device for device in new if device not in failed]
+            for device in added:
+                _LOGGER.info("Adding device %s", device.name)
+                self.devices[device.ac_unique_id] = device
+            await self._async_stop_devices([*removed, *failed])
+
+            if not self.periodic_fetch_energy_consumption_task and any(
+                device.supported.ac_energy_report for device in self.devices.values()
+            ):
+                self.periodic_fetch_energy_consumption_task = self.loop.create_task(
+                    self.periodic_fetch_energy_consumption()
+                )
+                try:
+                    await self.fetch_energy_consumption()
+                except Exception as ex:  # pylint: disable=broad-except
+                    _LOGGER.warning("Fetching energy consumption failed: %s", ex)
+
+        return added, removed
+
+    @staticmethod
+    async def _async_start_cached(device: ToshibaAcDevice) -> None:
+        """Start a cached device and replace its cached state."""
+        await device.connect()
+        await device.state_reload()
+
+    @staticmethod
+    async def _async_stop_devices(devices: list[ToshibaAcDevice]) -> None:
+        """Stop the periodic state reload of devices, they can be started again."""
+        await asyncio.gather(
+            *(device.shutdown() for device in devices), return_exceptions=True
+        )
+        for device in devices:
+            device.periodic_reload_state_task = None
+
+    @property
+    def ingestion_diagnostics(self) -> dict[str, Any]:
+        """Return statistics of the push message bridge."""
+        messages = self.ingestion_stats["messages"]
+        updates = self.ingestion_stats["updates"]
+        return {
+            "messages": messages,
+            "updates": updates,
+            "dropped_stale": self.ingestion_stats["dropped"],
+            "wakeups": self.ingestion_stats["wakeups"],
+            "mailbox_depth": len(self._mailboxes),
+            "mailbox_depth_max": self.ingestion_depth_max,
+            "latency_avg_ms": round(
+                self.ingestion_stats["latency_total_us"] / updates / 1000, 3
+            )
+            if updates
+            else None,
+            "latency_max_ms": round(self.ingestion_latency_max * 1000, 3),
+            "cpu_per_message_us": round(
+                self.ingestion_stats["cpu_total_us"] / messages, 1
+            )
+            if messages
+            else None,
+        }
@@ -8,7 +8,12 @@ from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN
+from .const import (
+    DATA_LIFECYCLE_STATS,
+    DATA_STATE_WRITE_STATS,
+    DATA_WATCHDOG_STATS,
+    DOMAIN,
+)
 
 TO_REDACT = {
     "username",
@@ -36,10 +41,15 @@ async def async_get_config_entry_diagnostics(
         diagnostics_data["error"] = "Device manager not found"
         return diagnostics_data
 
+    write_stats = hass.data.get(DATA_STATE_WRITE_STATS, {})
+
     try:
         devices = await device_manager.get_devices()
         devices_data = []
         for device in devices:
+            device_write_stats = write_stats.get(device.ac_unique_id, {})
+            state_changes = device_write_stats.get("state_changes", 0)
+            state_writes = device_write_stats.get("state_writes", 0)
             device_info = {
                 "name": device.name,
                 "ac_id": "**REDACTED**",
@@ -94,11 +104,24 @@ async def async_get_config_entry_diagnostics(
                     else [],
                     "ac_energy_report": device.supported.ac_energy_report,
                 },
+                "state_writes": {
+                    "state_changes": state_changes,
+                    "state_writes": state_writes,
+                    "state_writes_coalesced": state_changes - state_writes,
+                },
             }
             devices_data.append(device_info)
 
         diagnostics_data["devices"] = devices_data
         diagnostics_data["device_count"] = len(devices)
+        diagnostics_data["connection_state"] = device_manager.connection_state
+        diagnostics_data["ingestion"] = device_manager.ingestion_diagnostics
+        if watchdog_stats := hass.data.get(DATA_WATCHDOG_STATS, {}).get(entry.entry_id):
+            diagnostics_data["watchdog"] = watchdog_stats.as_dict()
+        if lifecycle_stats := hass.data.get(DATA_LIFECYCLE_STATS, {}).get(
+            entry.entry_id
+        ):
+            diagnostics_data["lifecycle"] = lifecycle_stats.as_dict()
     except Exception as ex:
         diagnostics_data["error"] = f"Failed to get devices: {ex}"
 
@@ -0,0 +1,310 @@
+"""Energy report of all Toshiba AC units from the recorder statistics."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, tzinfo
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.history import get_significant_states
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, ENERGY_REPORT_PEAK_HOURS
+
+if TYPE_CHECKING:
+    from .device_manager import ToshibaAcHassDeviceManager
+
+_HOUR = 3600
+
+
+@dataclass(frozen=True, slots=True)
+class ToshibaAcReportUnit:
+    """A unit in the energy report with the entities its data comes from."""
+
+    name: str
+    energy_entity_id: str
+    climate_entity_id: str | None
+
+
+class ToshibaAcEnergyReport:
+    """Hourly energy and mode of all units as (unit, hour) arrays.
+
+    energy holds the kWh used in each hour, NaN where the recorder has no
+    statistics. mode holds an index into modes, the mode of the climate entity in
+    the middle of the hour.
+    """
+
+    def __init__(
+        self,
+        units: Sequence[ToshibaAcReportUnit],
+        start: datetime,
+        end: datetime,
+        time_zone: tzinfo,
+    ) -> None:
+        """Initialize an empty report for the hours from start to end."""
+        self.units = list(units)
+        self.time_zone = time_zone
+        self.start_ts = int(start.timestamp()) // _HOUR * _HOUR
+        hours = max(0, -(-int(end.timestamp() - self.start_ts) // _HOUR))
+        self.hours = self.start_ts + _HOUR * np.arange(hours, dtype=np.int64)
+        self.energy = np.full((len(self.units), hours), np.nan)
+        self.modes: list[str] = ["unknown"]
+        self.mode = np.zeros((len(self.units), hours), dtype=np.int16)
+
+        # Local days, so that DST changes end up in the right day
+        first = dt_util.utc_from_timestamp(self.start_ts).astimezone(time_zone).date()
+        last = (
+            dt_util.utc_from_timestamp(self.start_ts + _HOUR * max(0, hours - 1))
+            .astimezone(time_zone)
+            .date()
+        )
+        self.days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+        day_starts = np.array(
+            [
+                datetime.combine(day, datetime.min.time(), time_zone).timestamp()
+                for day in self.days
+            ]
+        )
+        self.day = np.searchsorted(day_starts, self.hours, side="right") - 1
+        # The wall-clock hour, on DST days an hour repeats or is skipped
+        self.hour_of_day = np.fromiter(
+            (
+                dt_util.utc_from_timestamp(int(hour)).astimezone(time_zone).hour
+                for hour in self.hours
+            ),
+            np.int64,
+            hours,
+        )
+
+    def add_statistics(self, unit: int, rows: Sequence[dict[str, Any]]) -> None:
+        """Add the hourly statistics rows of a unit, with start and change."""
+        starts = np.fromiter((row["start"] for row in rows), np.float64, len(rows))
+        changes = np.fromiter(
+            (np.nan if row.get("change") is None else row["change"] for row in rows),
+            np.float64,
+            len(rows),
+        )
+        index = ((starts - self.start_ts) // _HOUR).astype(np.int64)
+        valid = (index >= 0) & (index < self.hours.size)
+        self.energy[unit, index[valid]] = changes[valid]
+
+    def add_states(self, unit: int, rows: Sequence[dict[str, Any]]) -> None:
+        """Add the compressed states of the climate entity of a unit."""
+        if not rows:
+            return
+        changed = np.fromiter(
+            (row[COMPRESSED_STATE_LAST_UPDATED] for row in rows), np.float64, len(rows)
+        )
+        codes = np.fromiter(
+            (self._mode_code(row[COMPRESSED_STATE_STATE]) for row in rows),
+            np.int16,
+            len(rows),
+        )
+        index = np.searchsorted(changed, self.hours + _HOUR / 2, side="right") - 1
+        self.mode[unit] = np.where(index >= 0, codes[np.maximum(index, 0)], 0)
+
+    def _mode_code(self, state: str) -> int:
+        """Return the index of a mode, adding it if it is new."""
+        try:
+            return self.modes.index(state)
+        except ValueError:
+            self.modes.append(state)
+            return len(self.modes) - 1
+
+    def _per_unit(self, key: np.ndarray, size: int, energy: np.ndarray) -> np.ndarray:
+        """Sum the energy of each unit into size buckets by key."""
+        units = len(self.units)
+        flat = (np.arange(units)[:, None] * size + key).ravel()
+        return np.bincount(
+            flat, weights=energy.ravel(), minlength=units * size
+        ).reshape(units, size)
+
+    def summary(self) -> dict[str, Any]:
+        """Return the daily, hourly and per mode consumption of units and fleet."""
+        energy = np.nan_to_num(self.energy)
+        daily = self._per_unit(
+            np.broadcast_to(self.day, energy.shape), len(self.days), energy
+        )
+        by_hour = self._per_unit(
+            np.broadcast_to(self.hour_of_day, energy.shape), 24, energy
+        )
+        by_mode = self._per_unit(self.mode, len(self.modes), energy)
+        fleet_hourly = energy.sum(axis=0)
+        peaks = np.argsort(fleet_hourly)[::-1][:ENERGY_REPORT_PEAK_HOURS]
+
+        units = []
+        for i, unit in enumerate(self.units):
+            has_data = bool(np.isfinite(self.energy[i]).any())
+            peak = int(np.argmax(energy[i])) if has_data else None
+            units.append(
+                {
+                    "name": unit.name,
+                    "energy_entity_id": unit.energy_entity_id,
+                    "climate_entity_id": unit.climate_entity_id,
+                    "total_kwh": _round(energy[i].sum()),
+                    "daily_kwh": _round_all(daily[i]),
+                    "hour_of_day_kwh": _round_all(by_hour[i]),
+                    "peak_hour": None
+                    if peak is None
+                    else {"start": self._hour(peak), "kwh": _round(energy[i, peak])},
+                    "modes_kwh": self._modes(by_mode[i]),
+                }
+            )
+
+        return {
+            "start": self._hour(0) if self.hours.size else None,
+            "end": dt_util.utc_from_timestamp(self.start_ts + _HOUR * self.hours.size)
+            .astimezone(self.time_zone)
+            .isoformat(),
+            "days": [day.isoformat() for day in self.days],
+            "fleet": {
+                "total_kwh": _round(fleet_hourly.sum()),
+                "daily_kwh": _round_all(daily.sum(axis=0)),
+                "hour_of_day_kwh": _round_all(by_hour.sum(axis=0)),
+                "peak_hours": [
+                    {"start": self._hour(int(i)), "kwh": _round(fleet_hourly[i])}
+                    for i in peaks
+                    if fleet_hourly[i] > 0
+                ],
+                "modes_kwh": self._modes(by_mode.sum(axis=0)),
+            },
+            "units": units,
+        }
+
+    def _hour(self, index: int) -> str:
+        """Return the start of an hour as an ISO string in local time."""
+        return (
+            dt_util.utc_from_timestamp(int(self.hours[index]))
+            .astimezone(self.time_zone)
+            .isoformat()
+        )
+
+    def _modes(self, energy: np.ndarray) -> dict[str, float]:
+        """Return the energy per mode, leaving out modes without any."""
+        return {
+            mode: _round(value) for mode, value in zip(self.modes, energy) if value > 0
+        }
+
+    def write_csv(self, path: str) -> None:
+        """Write the energy and mode of every unit and hour, run in the executor."""
+        header = ["start"]
+        for unit in self.units:
+            header += [f"{unit.name} kWh", f"{unit.name} mode"]
+
+        energy = np.char.mod("%.3f", self.energy.T)
+        energy[np.isnan(self.energy.T)] = ""
+        modes = np.asarray(self.modes)[self.mode.T]
+        columns = np.empty((self.hours.size, 2 * len(self.units)), dtype=object)
+        columns[:, 0::2] = energy
+        columns[:, 1::2] = modes
+
+        with open(path, "w", encoding="utf-8", newline="") as csv_file:
+            csv_file.write(",".join(_csv_field(field) for field in header) + "\n")
+            for index, row in enumerate(columns):
+                csv_file.write(f"{self._hour(index)},{','.join(row)}\n")
+
+
+def _round(value: float) -> float:
+    """Round an energy value for the report."""
+    return round(float(value), 3)
+
+
+def _round_all(values: np.ndarray) -> list[float]:
+    """Round energy values for the report."""
+    return np.round(values, 3).tolist()
+
+
+def _csv_field(value: str) -> str:
+    """Quote a CSV field if needed."""
+    if any(char in value for char in ',"\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+@callback
+def async_get_report_units(
+    hass: HomeAssistant, device_managers: Sequence[ToshibaAcHassDeviceManager]
+) -> list[ToshibaAcReportUnit]:
+    """Return the units of all accounts that have an energy sensor."""
+    entity_registry = er.async_get(hass)
+    units = []
+    for device_manager in device_managers:
+        for ac_unique_id, device in device_manager.devices.items():
+            energy_entity_id = entity_registry.async_get_entity_id(
+                "sensor", DOMAIN, f"{ac_unique_id}_sensor"
+            )
+            if energy_entity_id is None:
+                continue
+            units.append(
+                ToshibaAcReportUnit(
+                    device.name,
+                    energy_entity_id,
+                    entity_registry.async_get_entity_id(
+                        "climate", DOMAIN, f"{ac_unique_id}_climate"
+                    ),
+                )
+            )
+    return units
+
+
+async def async_energy_report(
+    hass: HomeAssistant,
+    units: Sequence[ToshibaAcReportUnit],
+    start: datetime,
+    end: datetime,
+) -> ToshibaAcEnergyReport:
+    """Load the statistics and climate history of all units in one go."""
+    return await get_instance(hass).async_add_executor_job(
+        _load_energy_report, hass, units, start, end
+    )
+
+
+def _load_energy_report(
+    hass: HomeAssistant,
+    units: Sequence[ToshibaAcReportUnit],
+    start: datetime,
+    end: datetime,
+) -> ToshibaAcEnergyReport:
+    """Query the recorder for all units and fill a report, run in its executor."""
+    report = ToshibaAcEnergyReport(units, start, end, dt_util.get_default_time_zone())
+    start = dt_util.utc_from_timestamp(report.start_ts)
+    statistics = statistics_during_period(
+        hass,
+        start,
+        end,
+        {unit.energy_entity_id for unit in units},
+        "hour",
+        {"energy": "kWh"},
+        {"change"},
+    )
+    climate_entity_ids = [
+        unit.climate_entity_id for unit in units if unit.climate_entity_id
+    ]
+    states = (
+        get_significant_states(
+            hass,
+            start,
+            end,
+            climate_entity_ids,
+            include_start_time_state=True,
+            minimal_response=True,
+            no_attributes=True,
+            compressed_state_format=True,
+        )
+        if climate_entity_ids
+        else {}
+    )
+
+    for index, unit in enumerate(units):
+        report.add_statistics(index, statistics.get(unit.energy_entity_id, []))
+        if unit.climate_entity_id:
+            report.add_states(index, states.get(unit.climate_entity_id, []))
+    return report
@@ -2,22 +2,50 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import Counter
 import logging
+import time
+from typing import TYPE_CHECKING, Any
 
 from toshiba_ac.device import ToshibaAcDevice
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
 
-from .const import DOMAIN
+from .command_buffer import ToshibaAcCommandBuffer
+from .const import (
+    DATA_COMMAND_BUFFERS,
+    DATA_CONNECTION_STATES,
+    DATA_STATE_WRITE_STATS,
+    DATA_TRACERS,
+    DOMAIN,
+    SIGNAL_CONNECTION_STATE_CHANGED,
+    STATE_WRITE_COALESCE_DELAY,
+    ToshibaAcConnectionState,
+)
+from .tracing import current_trace
+
+if TYPE_CHECKING:
+    from .device_manager import ToshibaAcHassDeviceManager
+    from .tracing import ToshibaAcTracer
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class ToshibaAcEntity(Entity):
-    """Representation of a Toshiba AC device entity."""
+    """Representation of a Toshiba AC device entity.
+
+    Availability follows the connection state of the device manager, which is
+    pushed to all of its entities when it changes. Commands go through the
+    device manager, which buffers them while the link is down, if the device
+    has a buffer.
+    """
 
     _attr_should_poll = False
+    _attr_available = False
 
     def __init__(self, toshiba_device: ToshibaAcDevice) -> None:
         """Initialize the entity."""
@@ -31,30 +59,114 @@ class ToshibaAcEntity(Entity):
         )
 
     @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return bool(
-            self._device.ac_id
-            and self._device.amqp_api.sas_token
-            and self._device.http_api.access_token
+    def device(self) -> ToshibaAcDevice:
+        """Return the Toshiba AC device of this entity."""
+        return self._device
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the connection state of the device manager."""
+        connection_state = self.hass.data.get(DATA_CONNECTION_STATES, {}).get(
+            self._device.device_id, ToshibaAcConnectionState.DISCONNECTED
+        )
+        self._attr_available = connection_state.available
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{SIGNAL_CONNECTION_STATE_CHANGED}_{self._device.device_id}",
+                self._connection_state_changed,
+            )
+        )
+
+    @callback
+    def _connection_state_changed(
+        self, connection_state: ToshibaAcConnectionState
+    ) -> None:
+        """Update the availability when the connection state changes."""
+        if self._attr_available != connection_state.available:
+            self._attr_available = connection_state.available
+            self.async_write_ha_state()
+
+    @property
+    def device_manager(self) -> ToshibaAcHassDeviceManager:
+        """Return the device manager of the config entry of this entity."""
+        return self.hass.data[DOMAIN][self.platform.config_entry.entry_id]
+
+    @property
+    def command_buffer(self) -> ToshibaAcCommandBuffer | None:
+        """Return the command buffer of the device, if buffering is enabled."""
+        return self.hass.data.get(DATA_COMMAND_BUFFERS, {}).get(
+            self._device.ac_unique_id
         )
 
+    @property
+    def tracer(self) -> ToshibaAcTracer | None:
+        """Return the command tracer of the device, if tracing is enabled."""
+        return self.hass.data.get(DATA_TRACERS, {}).get(self._device.device_id)
+
+    async def async_send_command(self, setter: str, value: Any) -> None:
+        """Send a command through the device manager and trace it if sampled."""
+        trace = current_trace()
+        start = time.time()
+        try:
+            sent = await self.device_manager.async_send_command(
+                self._device, setter, value, self.command_buffer
+            )
+        except Exception as ex:
+            if trace is not None:
+                trace.span("send", start, time.time(), setter=setter, error=str(ex))
+            raise
+        if trace is None:
+            return
+        if not sent:
+            trace.span(
+                "send", start, time.time(), setter=setter, value=value, buffered=True
+            )
+        else:
+            trace.span("send", start, time.time(), setter=setter, value=value)
+            if (tracer := self.tracer) is not None:
+                tracer.await_confirmation(trace, self._device, setter, value)
+
 
 class ToshibaAcStateEntity(ToshibaAcEntity):
-    """Base class for entities that subscribe to the device's state_changed callback."""
+    """Base class for entities that subscribe to the device's state_changed callback.
+
+    State changes only mark the entity dirty; a burst of changes within
+    STATE_WRITE_COALESCE_DELAY results in a single write of the final state.
+    """
+
+    _flush_handle: asyncio.TimerHandle | None = None
+    _write_stats: Counter[str]
 
     async def async_added_to_hass(self) -> None:
         """Subscribe to the device's state_changed callback."""
+        await super().async_added_to_hass()
+        self._write_stats = self.hass.data.setdefault(
+            DATA_STATE_WRITE_STATS, {}
+        ).setdefault(self._device.ac_unique_id, Counter())
         self._device.on_state_changed_callback.add(self._state_changed)
 
     async def async_will_remove_from_hass(self) -> None:
         """Call when device is removed from HA."""
         self._device.on_state_changed_callback.remove(self._state_changed)
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
 
     def update_attrs(self) -> None:
         """Call when the Toshiba AC device state changes."""
 
     def _state_changed(self, _device: ToshibaAcDevice) -> None:
         """Call when the Toshiba AC device state changes."""
+        self._write_stats["state_changes"] += 1
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(
+                STATE_WRITE_COALESCE_DELAY, self._flush_state
+            )
+
+    @callback
+    def _flush_state(self) -> None:
+        """Write the latest device state to Home Assistant."""
+        self._flush_handle = None
+        self._write_stats["state_writes"] += 1
         self.update_attrs()
         self.async_write_ha_state()
@@ -6,6 +6,8 @@ from typing import Generic, TypeVar
 
 from toshiba_ac.device import ToshibaAcDevice, ToshibaAcFeatures
 
+from .entity import ToshibaAcEntity
+
 _LOGGER = getLogger(__name__)
 TEnum = TypeVar("TEnum", bound=Enum)
 
@@ -17,7 +19,7 @@ class ToshibaAcEnumEntityDescriptionMixin(Generic[TEnum]):
     ac_attr_setter: str
 
     async def async_set_attr(
-        self, device: ToshibaAcDevice, value: TEnum | None
+        self, entity: ToshibaAcEntity, value: TEnum | None
     ) -> None:
         """Set the provided option enum value."""
         if not self.ac_attr_setter and not self.ac_attr_name:
@@ -25,8 +27,10 @@ class ToshibaAcEnumEntityDescriptionMixin(Generic[TEnum]):
         if value is None:
             return
         setter = self.ac_attr_setter or f"set_{self.ac_attr_name}"
-        _LOGGER.info("AC device %s calling %s %s", device.name, setter, value.name)
-        await getattr(device, setter)(value)
+        _LOGGER.info(
+            "AC device %s calling %s %s", entity.device.name, setter, value.name
+        )
+        await entity.async_send_command(setter, value)
 
     def get_device_attr(self, device: ToshibaAcDevice) -> TEnum | None:
         """Return the current option enum value."""
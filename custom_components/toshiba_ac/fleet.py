@@ -0,0 +1,205 @@
+"""Incrementally maintained aggregates over all Toshiba AC devices of an entry."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable, Mapping
+import logging
+from typing import NamedTuple
+
+from toshiba_ac.device import ToshibaAcDevice, ToshibaAcStatus
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ToshibaAcRunningStats:
+    """Mean, min and max of a multiset of values with O(1) add and remove.
+
+    The mean is O(1) as well. Min and max scan the distinct values currently
+    present. Temperatures are reported as whole degrees, so there are at most as
+    many of them as degrees in the range of the units, however many units there
+    are.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty stats."""
+        self._values: Counter[float] = Counter()
+        self._sum = 0.0
+        self._count = 0
+
+    def add(self, value: float | None) -> None:
+        """Add a value, None is ignored."""
+        if value is None:
+            return
+        self._values[value] += 1
+        self._sum += value
+        self._count += 1
+
+    def remove(self, value: float | None) -> None:
+        """Remove a previously added value, None is ignored."""
+        if value is None:
+            return
+        self._values[value] -= 1
+        if not self._values[value]:
+            del self._values[value]
+        self._sum -= value
+        self._count -= 1
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of all values."""
+        return round(self._sum / self._count, 1) if self._count else None
+
+    @property
+    def min(self) -> float | None:
+        """Return the smallest value."""
+        return min(self._values) if self._values else None
+
+    @property
+    def max(self) -> float | None:
+        """Return the largest value."""
+        return max(self._values) if self._values else None
+
+
+class _Contribution(NamedTuple):
+    """What a single device currently adds to the aggregates."""
+
+    energy_wh: float | None
+    running_mode: str | None
+    indoor_temperature: int | None
+    outdoor_temperature: int | None
+
+
+_NO_CONTRIBUTION = _Contribution(None, None, None, None)
+
+
+class ToshibaAcFleetAggregator:
+    """Keep fleet totals up to date from per-device deltas.
+
+    Each device callback only subtracts the previous contribution of that device
+    and adds the new one, so an update costs the same for 1 or 100 units.
+
+    The energy total feeds a TOTAL_INCREASING sensor, where any decrease counts
+    as a meter reset. Float deltas would drift, so the total is kept in whole
+    mWh. Adding and subtracting integers is exact, and the total always equals
+    the sum of the rounded counters. It is unknown until every unit with energy
+    reports has reported. Units that leave the account keep their last counter
+    in departed_energy_wh, so their removal does not lower the total.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the aggregator."""
+        self._devices: dict[str, ToshibaAcDevice] = {}
+        self._contributions: dict[str, _Contribution] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self.departed_energy_wh: dict[str, float] = {}
+        self._energy_mwh = 0
+        self._energy_pending: set[str] = set()
+        self.running_units: Counter[str] = Counter()
+        self.indoor_temperature = ToshibaAcRunningStats()
+        self.outdoor_temperature = ToshibaAcRunningStats()
+
+    def add_device(self, device: ToshibaAcDevice) -> None:
+        """Start aggregating a device."""
+        if device.ac_unique_id in self._devices:
+            return
+        self._devices[device.ac_unique_id] = device
+        # A unit that comes back continues its own counter
+        if (
+            energy_wh := self.departed_energy_wh.pop(device.ac_unique_id, None)
+        ) is not None:
+            self._energy_mwh -= _to_mwh(energy_wh)
+        device.on_state_changed_callback.add(self._device_changed)
+        device.on_energy_consumption_changed_callback.add(self._device_changed)
+        self._device_changed(device)
+
+    def remove_device(self, device: ToshibaAcDevice) -> None:
+        """Stop aggregating a device and drop its contribution."""
+        if self._devices.pop(device.ac_unique_id, None) is None:
+            return
+        device.on_state_changed_callback.remove(self._device_changed)
+        device.on_energy_consumption_changed_callback.remove(self._device_changed)
+        if (
+            energy_wh := self._contributions[device.ac_unique_id].energy_wh
+        ) is not None:
+            self.departed_energy_wh[device.ac_unique_id] = energy_wh
+            self._energy_mwh += _to_mwh(energy_wh)
+        self._energy_pending.discard(device.ac_unique_id)
+        self._apply(device.ac_unique_id, _NO_CONTRIBUTION)
+        del self._contributions[device.ac_unique_id]
+        for listener in list(self._listeners):
+            listener()
+
+    def remove_all(self) -> None:
+        """Stop aggregating all devices."""
+        for device in list(self._devices.values()):
+            self.remove_device(device)
+
+    def restore_departed(self, departed_energy_wh: Mapping[str, float]) -> None:
+        """Restore the counters of departed units, e.g. after a restart."""
+        for ac_unique_id, energy_wh in departed_energy_wh.items():
+            if (
+                ac_unique_id not in self._devices
+                and ac_unique_id not in self.departed_energy_wh
+            ):
+                self.departed_energy_wh[ac_unique_id] = float(energy_wh)
+                self._energy_mwh += _to_mwh(energy_wh)
+
+    @property
+    def energy_wh(self) -> float | None:
+        """Return the energy of all units, None until all of them reported."""
+        if self._energy_pending:
+            return None
+        return self._energy_mwh / 1000
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener when the aggregates change, return a remove function."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _device_changed(self, device: ToshibaAcDevice) -> None:
+        """Update the aggregates with the latest values of a device."""
+        consumption = device.ac_energy_consumption
+        contribution = _Contribution(
+            consumption.energy_wh if consumption else None,
+            device.ac_mode.name.lower()
+            if device.ac_status == ToshibaAcStatus.ON
+            else None,
+            device.ac_indoor_temperature,
+            device.ac_outdoor_temperature,
+        )
+        if consumption is None and device.supported.ac_energy_report:
+            self._energy_pending.add(device.ac_unique_id)
+        else:
+            self._energy_pending.discard(device.ac_unique_id)
+        if self._apply(device.ac_unique_id, contribution):
+            for listener in list(self._listeners):
+                listener()
+
+    def _apply(self, ac_unique_id: str, new: _Contribution) -> bool:
+        """Replace the contribution of a device, return True if it changed."""
+        old = self._contributions.get(ac_unique_id, _NO_CONTRIBUTION)
+        if old == new:
+            return False
+        self._contributions[ac_unique_id] = new
+
+        if old.energy_wh is not None:
+            self._energy_mwh -= _to_mwh(old.energy_wh)
+        if new.energy_wh is not None:
+            self._energy_mwh += _to_mwh(new.energy_wh)
+        if old.running_mode is not None:
+            self.running_units[old.running_mode] -= 1
+            if not self.running_units[old.running_mode]:
+                del self.running_units[old.running_mode]
+        if new.running_mode is not None:
+            self.running_units[new.running_mode] += 1
+        self.indoor_temperature.remove(old.indoor_temperature)
+        self.indoor_temperature.add(new.indoor_temperature)
+        self.outdoor_temperature.remove(old.outdoor_temperature)
+        self.outdoor_temperature.add(new.outdoor_temperature)
+        return True
+
+
+def _to_mwh(energy_wh: float) -> int:
+    """Return an energy in whole mWh."""
+    return round(energy_wh * 1000)
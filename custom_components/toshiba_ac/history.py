@@ -0,0 +1,149 @@
+"""Compact temperature history of Toshiba AC devices."""
+
+from __future__ import annotations
+
+from array import array
+import math
+
+from toshiba_ac.device import ToshibaAcMode
+
+from .const import (
+    TEMPERATURE_HISTORY_SIZE,
+    TEMPERATURE_RATE_MIN_SAMPLES,
+    TEMPERATURE_RATE_WINDOW,
+)
+
+_NO_MODE = 0
+
+
+def _mode_code(mode: ToshibaAcMode) -> int:
+    """Return the mode as a small integer for the mode array."""
+    return mode.value or _NO_MODE
+
+
+class ToshibaAcTemperatureHistory:
+    """Ring buffer of (timestamp, indoor, target, mode) samples of a single device.
+
+    Samples live in preallocated typed arrays, so memory is fixed at a few bytes
+    per slot no matter how long the device runs. Missing temperatures are NaN and
+    ToshibaAcMode.NONE marks samples taken while the device was off.
+    """
+
+    def __init__(self, size: int = TEMPERATURE_HISTORY_SIZE) -> None:
+        """Initialize an empty history."""
+        self.size = size
+        self._timestamps = array("d", bytes(8 * size))
+        self._indoor = array("d", bytes(8 * size))
+        self._target = array("d", bytes(8 * size))
+        self._mode = array("b", bytes(size))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return self._count
+
+    def add(
+        self,
+        timestamp: float,
+        indoor: float | None,
+        target: float | None,
+        mode: ToshibaAcMode,
+    ) -> None:
+        """Add a sample, unless nothing changed since the previous one."""
+        indoor = math.nan if indoor is None else float(indoor)
+        target = math.nan if target is None else float(target)
+        mode_code = _mode_code(mode)
+
+        if self._count:
+            last = self._next - 1
+            if (
+                self._mode[last] == mode_code
+                and _same(self._indoor[last], indoor)
+                and _same(self._target[last], target)
+            ):
+                return
+
+        i = self._next
+        self._timestamps[i] = timestamp
+        self._indoor[i] = indoor
+        self._target[i] = target
+        self._mode[i] = mode_code
+        self._next = (i + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+
+    def rate(self, now: float) -> float | None:
+        """Return the indoor temperature change in degrees per second.
+
+        The slope is a least squares fit over the most recent samples with the
+        current mode and target, at most TEMPERATURE_RATE_WINDOW seconds old.
+        """
+        if not self._count:
+            return None
+
+        last = self._next - 1
+        mode_code = self._mode[last]
+        target = self._target[last]
+        oldest = now - TEMPERATURE_RATE_WINDOW.total_seconds()
+
+        n = 0
+        sum_t = sum_y = sum_tt = sum_ty = 0.0
+        for k in range(self._count):
+            i = (last - k) % self.size
+            timestamp = self._timestamps[i]
+            if (
+                timestamp < oldest
+                or self._mode[i] != mode_code
+                or not _same(self._target[i], target)
+            ):
+                break
+            if math.isnan(indoor := self._indoor[i]):
+                continue
+            # Relative to now to keep the sums small
+            t = timestamp - now
+            n += 1
+            sum_t += t
+            sum_y += indoor
+            sum_tt += t * t
+            sum_ty += t * indoor
+
+        if n < TEMPERATURE_RATE_MIN_SAMPLES:
+            return None
+        denominator = n * sum_tt - sum_t * sum_t
+        if denominator <= 0:
+            return None
+        return (n * sum_ty - sum_t * sum_y) / denominator
+
+    def seconds_to_target(self, now: float) -> float | None:
+        """Return the estimated time until the indoor temperature reaches target."""
+        if not self._count:
+            return None
+
+        last = self._next - 1
+        indoor = self._indoor[last]
+        target = self._target[last]
+        if math.isnan(indoor) or math.isnan(target):
+            return None
+
+        mode_code = self._mode[last]
+        if mode_code in (_NO_MODE, _mode_code(ToshibaAcMode.FAN)):
+            return None
+
+        difference = target - indoor
+        if (
+            difference == 0
+            or (mode_code == _mode_code(ToshibaAcMode.HEAT) and difference < 0)
+            or (mode_code == _mode_code(ToshibaAcMode.COOL) and difference > 0)
+        ):
+            return 0.0
+
+        rate = self.rate(now)
+        if not rate or (rate > 0) != (difference > 0):
+            # Not moving towards the target
+            return None
+        return difference / rate
+
+
+def _same(a: float, b: float) -> bool:
+    """Return True if both values are equal or both are missing."""
+    return a == b or (math.isnan(a) and math.isnan(b))
@@ -0,0 +1,43 @@
+"""HTTP API of the Toshiba cloud on Home Assistant's shared client session."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import aiohttp
+
+# toshiba_ac.utils.http_api imports the device package, which imports it back,
+# so it can only be imported after the device package
+import toshiba_ac.device  # noqa: F401  # pylint: disable=unused-import
+from toshiba_ac.utils.http_api import ToshibaAcHttpApi, ToshibaAcHttpApiError
+
+
+class ToshibaAcHassHttpApi(ToshibaAcHttpApi):
+    """Toshiba AC HTTP API using a session it does not own.
+
+    The library creates a private aiohttp session per API instance, with its own
+    connection pool. Using Home Assistant's shared session lets logins, polls and
+    reconnects reuse warm keep-alive connections to the Toshiba cloud.
+
+    The session is never cleared: the library creates a private session for a
+    request without one, which would leak after shutdown. Requests after
+    shutdown are rejected instead.
+    """
+
+    def __init__(
+        self, username: str, password: str, session: aiohttp.ClientSession
+    ) -> None:
+        """Initialize the API on the given session."""
+        super().__init__(username, password)
+        self.session = session
+        self._shut_down = False
+
+    async def request_api(self, path: str, *args: Any, **kwargs: Any) -> Any:
+        """Send a request, unless the API has been shut down."""
+        if self._shut_down:
+            raise ToshibaAcHttpApiError(f"Request to {path} after shutdown")
+        return await super().request_api(path, *args, **kwargs)
+
+    async def shutdown(self) -> None:
+        """Reject further requests, the session is closed by Home Assistant."""
+        self._shut_down = True
@@ -0,0 +1,94 @@
+"""Track setup/unload latency and resources left behind by unloaded entries."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .device_manager import ToshibaAcHassDeviceManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class ToshibaAcPhaseStats:
+    """Durations of one lifecycle phase, e.g. setup."""
+
+    count: int = 0
+    last: float | None = None
+    max: float = 0.0
+    total: float = 0.0
+
+    def add(self, duration: float) -> None:
+        """Add the duration of a finished phase."""
+        self.count += 1
+        self.last = duration
+        self.max = max(self.max, duration)
+        self.total += duration
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the durations in milliseconds for diagnostics."""
+        return {
+            "count": self.count,
+            "last_ms": None if self.last is None else round(self.last * 1000, 1),
+            "avg_ms": round(self.total / self.count * 1000, 1) if self.count else None,
+            "max_ms": round(self.max * 1000, 1),
+        }
+
+
+@dataclass
+class ToshibaAcLifecycleStats:
+    """Lifecycle counters of a config entry, kept across reloads."""
+
+    setup: ToshibaAcPhaseStats = field(default_factory=ToshibaAcPhaseStats)
+    unload: ToshibaAcPhaseStats = field(default_factory=ToshibaAcPhaseStats)
+    leaked_callbacks: int = 0
+    leaked_tasks: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "setup": self.setup.as_dict(),
+            "unload": self.unload.as_dict(),
+            "leaked_callbacks": self.leaked_callbacks,
+            "leaked_tasks": self.leaked_tasks,
+        }
+
+    def check_leaks(self, device_manager: ToshibaAcHassDeviceManager) -> None:
+        """Count callbacks and tasks still held after the manager was shut down.
+
+        Entities, buffers and aggregates must have removed their device callbacks
+        by now. Anything left keeps the old devices, and everything reachable from
+        their callbacks, alive after each reload.
+        """
+        callbacks = 0
+        tasks = 0
+        for device in device_manager.devices.values():
+            leftover = len(device.on_state_changed_callback.callbacks) + len(
+                device.on_energy_consumption_changed_callback.callbacks
+            )
+            if leftover:
+                _LOGGER.warning(
+                    "AC device %s still has %d callback(s) after unload",
+                    device.name,
+                    leftover,
+                )
+            callbacks += leftover
+            if device.periodic_reload_state_task and not (
+                device.periodic_reload_state_task.done()
+            ):
+                tasks += 1
+
+        for task in (
+            device_manager.periodic_fetch_energy_consumption_task,
+            device_manager.drain_task,
+        ):
+            if task is not None and not task.done():
+                tasks += 1
+
+        if tasks:
+            _LOGGER.warning("%d task(s) still running after unload", tasks)
+        self.leaked_callbacks += callbacks
+        self.leaked_tasks += tasks
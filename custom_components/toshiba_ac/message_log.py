@@ -0,0 +1,97 @@
+"""Record the messages received from the Toshiba cloud and read them back."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import MESSAGE_LOG_FLUSH_DELAY, MESSAGE_LOG_MAX_BYTES
+
+_LOGGER = logging.getLogger(__name__)
+
+KIND_ENERGY = "ENERGY"
+
+
+class ToshibaAcMessageRecorder:
+    """Append received messages to a gzipped JSONL file.
+
+    Each line holds the POSIX time the message was received (t), the kind of
+    message (c), the ac_unique_id of the device (id) and the payload (p). Times
+    are absolute, so a file that spans a restart keeps its timing. Lines are
+    collected on the event loop and appended in batches from the executor, each
+    batch as its own gzip member. When the file is full it is moved to .1.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize the recorder."""
+        self.hass = hass
+        self.path = path
+        # Converts the monotonic receive times to POSIX times
+        self._clock_offset = time.time() - time.monotonic()
+        self._lines: list[str] = []
+        self._flush_handle: Any = None
+
+    @callback
+    def record(
+        self, kind: str, ac_unique_id: str, payload: Any, timestamp: float
+    ) -> None:
+        """Record a message received at the given monotonic timestamp."""
+        self._lines.append(
+            json.dumps(
+                {
+                    "t": round(timestamp + self._clock_offset, 3),
+                    "c": kind,
+                    "id": ac_unique_id,
+                    "p": payload,
+                },
+                separators=(",", ":"),
+            )
+        )
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(
+                MESSAGE_LOG_FLUSH_DELAY, self._schedule_flush
+            )
+
+    @callback
+    def _schedule_flush(self) -> None:
+        """Write the recorded messages in the background."""
+        self._flush_handle = None
+        self.hass.async_create_background_task(
+            self.async_flush(), "toshiba_ac message log flush"
+        )
+
+    async def async_flush(self) -> None:
+        """Write all recorded messages."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._lines:
+            return
+        data = ("\n".join(self._lines) + "\n").encode()
+        self._lines = []
+        try:
+            await self.hass.async_add_executor_job(self._write, data)
+        except OSError as ex:
+            _LOGGER.warning("Writing messages to %s failed: %s", self.path, ex)
+
+    def _write(self, data: bytes) -> None:
+        """Append a batch of lines to the file."""
+        try:
+            if os.path.getsize(self.path) > MESSAGE_LOG_MAX_BYTES:
+                os.replace(self.path, f"{self.path}.1")
+        except FileNotFoundError:
+            pass
+        with open(self.path, "ab") as log_file:
+            log_file.write(gzip.compress(data))
+
+
+def load_messages(path: str) -> list[dict[str, Any]]:
+    """Read a recording, run in the executor."""
+    with gzip.open(path, "rt", encoding="utf-8") as log_file:
+        return [json.loads(line) for line in log_file if line.strip()]
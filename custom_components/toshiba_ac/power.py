@@ -0,0 +1,94 @@
+"""Derive the power draw of Toshiba AC devices from their energy reports."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import math
+
+from .const import POWER_SMOOTHING_TIME_CONSTANT
+
+
+class ToshibaAcPowerEstimator:
+    """Smoothed average power from successive cumulative energy reports.
+
+    Only the previous report and the smoothed value are kept. Smoothing is
+    weighted by time, so a long gap between reports counts more than a short one.
+
+    Power is only computed from reports where the counter changed. Between them
+    power_at() scales the value down once the counter is overdue, without moving
+    the reference report.
+    """
+
+    __slots__ = (
+        "time_constant",
+        "power_w",
+        "_energy_wh",
+        "_since",
+        "_timestamp",
+        "_interval",
+    )
+
+    def __init__(self, time_constant: float = POWER_SMOOTHING_TIME_CONSTANT) -> None:
+        """Initialize the estimator."""
+        self.time_constant = time_constant
+        self.power_w: float | None = None
+        self._energy_wh: float | None = None
+        self._since: datetime | None = None
+        self._timestamp = 0.0
+        self._interval: float | None = None
+
+    def power_at(self, timestamp: float) -> float | None:
+        """Return the power to show at timestamp, lower if the counter is overdue.
+
+        The counter last rose after _interval seconds. If it has not risen for
+        longer, less than that step was used since, so the power is at most
+        power_w * _interval / elapsed.
+        """
+        if self.power_w is None or self._interval is None:
+            return self.power_w
+        elapsed = timestamp - self._timestamp
+        if elapsed <= self._interval:
+            return self.power_w
+        return self.power_w * self._interval / elapsed
+
+    def update(
+        self, energy_wh: float, since: datetime, timestamp: float
+    ) -> float | None:
+        """Add the energy used since `since` as of timestamp, return the power.
+
+        Reports with an unchanged counter are ignored.
+        """
+        if since != self._since:
+            if self._energy_wh is None or since.timestamp() < self._timestamp:
+                # First report, or no usable reference point for the new period
+                self._set_reference(energy_wh, since, timestamp)
+                return self.power_w
+            # Counter was reset, e.g. at the start of a year: count from the reset
+            self._set_reference(0.0, since, since.timestamp())
+        elif self._energy_wh is None or energy_wh < self._energy_wh:
+            self._set_reference(energy_wh, since, timestamp)
+            return self.power_w
+        elif energy_wh == self._energy_wh:
+            return self.power_w
+
+        elapsed = timestamp - self._timestamp
+        if elapsed <= 0:
+            return self.power_w
+
+        power_w = (energy_wh - self._energy_wh) * 3600 / elapsed
+        if self.power_w is None:
+            self.power_w = power_w
+        else:
+            weight = 1 - math.exp(-elapsed / self.time_constant)
+            self.power_w += weight * (power_w - self.power_w)
+        self._interval = elapsed
+        self._set_reference(energy_wh, since, timestamp)
+        return self.power_w
+
+    def _set_reference(
+        self, energy_wh: float, since: datetime, timestamp: float
+    ) -> None:
+        """Remember the report the next one is compared with."""
+        self._energy_wh = energy_wh
+        self._since = since
+        self._timestamp = timestamp
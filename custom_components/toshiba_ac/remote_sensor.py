@@ -0,0 +1,109 @@
+"""Follow the temperature of an external room sensor with the unit's setpoint."""
+
+from __future__ import annotations
+
+import math
+
+from .const import (
+    REMOTE_SENSOR_BUDGET_PERIOD,
+    REMOTE_SENSOR_COMMAND_BUDGET,
+    REMOTE_SENSOR_HYSTERESIS,
+    REMOTE_SENSOR_MAX_OFFSET,
+)
+
+
+class ToshibaAcCommandBudget:
+    """Token bucket limiting how many commands may be sent per period."""
+
+    __slots__ = ("capacity", "period", "tokens", "updated")
+
+    def __init__(
+        self,
+        now: float,
+        capacity: int = REMOTE_SENSOR_COMMAND_BUDGET,
+        period: float = REMOTE_SENSOR_BUDGET_PERIOD.total_seconds(),
+    ) -> None:
+        """Initialize a full budget."""
+        self.capacity = capacity
+        self.period = period
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last update."""
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated) * self.capacity / self.period,
+        )
+        self.updated = now
+
+    def try_consume(self, now: float) -> bool:
+        """Take a token if one is left, return False if the budget is spent."""
+        self._refill(now)
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def seconds_until_available(self, now: float) -> float:
+        """Return how long until the next token is available."""
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) * self.period / self.capacity)
+
+
+class ToshibaAcTemperatureFollower:
+    """Correct the setpoint of a unit by the error of its own sensor.
+
+    The unit regulates on the temperature at its ceiling cassette. The requested
+    temperature is meant for the room, so the unit gets the requested temperature
+    shifted by the difference between the unit's and the room sensor's readings.
+    A new setpoint is only due once the corrected value is REMOTE_SENSOR_HYSTERESIS
+    away from the current one, so sensor noise does not cause commands.
+    """
+
+    __slots__ = ("sensor_entity_id", "requested", "room_temperature", "budget")
+
+    def __init__(self, sensor_entity_id: str, now: float) -> None:
+        """Initialize the follower."""
+        self.sensor_entity_id = sensor_entity_id
+        self.requested: float | None = None
+        self.room_temperature: float | None = None
+        self.budget = ToshibaAcCommandBudget(now)
+
+    def offset(self, unit_temperature: float | None) -> float | None:
+        """Return how much warmer the unit's sensor reads than the room sensor."""
+        if unit_temperature is None or self.room_temperature is None:
+            return None
+        return max(
+            -REMOTE_SENSOR_MAX_OFFSET,
+            min(REMOTE_SENSOR_MAX_OFFSET, unit_temperature - self.room_temperature),
+        )
+
+    def setpoint(
+        self,
+        unit_temperature: float | None,
+        unit_setpoint: float | None,
+        min_temp: float,
+        max_temp: float,
+        force: bool = False,
+    ) -> int | None:
+        """Return the setpoint to send to the unit, None if the current one is fine.
+
+        With force, e.g. for a new requested temperature, the hysteresis is skipped.
+        """
+        if self.requested is None:
+            return None
+        if (offset := self.offset(unit_temperature)) is None:
+            # Without a room temperature the unit regulates on its own
+            offset = 0.0
+        target = max(min_temp, min(max_temp, self.requested + offset))
+        if (
+            not force
+            and unit_setpoint is not None
+            and abs(target - unit_setpoint) < REMOTE_SENSOR_HYSTERESIS
+        ):
+            return None
+        setpoint = int(math.floor(target + 0.5))
+        if setpoint == unit_setpoint:
+            return None
+        return setpoint
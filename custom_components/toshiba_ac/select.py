@@ -15,10 +15,13 @@ from toshiba_ac.device import (
 )
 
 from homeassistant.components.select import SelectEntity, SelectEntityDescription
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .const import DOMAIN
-from .entity import ToshibaAcStateEntity
+from .const import DOMAIN, SIGNAL_DEVICES_ADDED
+from .entity import ToshibaAcEntity, ToshibaAcStateEntity
 from .entity_description import ToshibaAcEnumEntityDescriptionMixin
+from .tracing import traced
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,7 +34,7 @@ class ToshibaAcSelectDescription(SelectEntityDescription):
 
     icon_mapping: dict[str, str] = field(default_factory=dict)
 
-    async def async_select_option_name(self, device: ToshibaAcDevice, name: str):
+    async def async_select_option_name(self, entity: ToshibaAcEntity, name: str):
         """Select the provided option."""
         pass
 
@@ -69,11 +72,11 @@ class ToshibaAcEnumSelectDescription(
     off_value: TEnum | None = None
     values: list[TEnum] = field(default_factory=list)
 
-    async def async_select_option_name(self, device: ToshibaAcDevice, name: str):
+    async def async_select_option_name(self, entity: ToshibaAcEntity, name: str):
         """Select a given option."""
         for value in self.values:
             if value.name.lower() == name:
-                await self.async_set_attr(device, value)
+                await self.async_set_attr(entity, value)
                 return
 
     def current_option_name(self, device: ToshibaAcDevice) -> str | None:
@@ -135,23 +138,34 @@ _SELECT_DESCRIPTIONS: Sequence[ToshibaAcSelectDescription] = [
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Add select entities for passed config_entry in HA."""
     device_manager = hass.data[DOMAIN][config_entry.entry_id]
-    new_entities = []
 
-    devices: list[ToshibaAcDevice] = await device_manager.get_devices()
-    for device in devices:
-        for entity_description in _SELECT_DESCRIPTIONS:
-            if entity_description.is_supported(device.supported):
-                new_entities.append(ToshibaAcSelectEntity(device, entity_description))
-            else:
-                _LOGGER.debug(
-                    "AC device %s does not support %s",
-                    device.name,
-                    entity_description.key,
-                )
-
-    if new_entities:
-        _LOGGER.info("Adding %d select entities", len(new_entities))
-        async_add_devices(new_entities)
+    @callback
+    def add_entities(devices: list[ToshibaAcDevice]) -> None:
+        """Add select entities for the given devices."""
+        new_entities = []
+        for device in devices:
+            for entity_description in _SELECT_DESCRIPTIONS:
+                if entity_description.is_supported(device.supported):
+                    new_entities.append(
+                        ToshibaAcSelectEntity(device, entity_description)
+                    )
+                else:
+                    _LOGGER.debug(
+                        "AC device %s does not support %s",
+                        device.name,
+                        entity_description.key,
+                    )
+
+        if new_entities:
+            _LOGGER.info("Adding %d select entities", len(new_entities))
+            async_add_devices(new_entities)
+
+    add_entities(await device_manager.get_devices())
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{SIGNAL_DEVICES_ADDED}_{config_entry.entry_id}", add_entities
+        )
+    )
 
 
 class ToshibaAcSelectEntity(ToshibaAcStateEntity, SelectEntity):
@@ -169,9 +183,10 @@ class ToshibaAcSelectEntity(ToshibaAcStateEntity, SelectEntity):
         self.entity_description = entity_description
         self.update_attrs()
 
+    @traced
     async def async_select_option(self, option: str) -> None:
         """Select a given option."""
-        await self.entity_description.async_select_option_name(self._device, option)
+        await self.entity_description.async_select_option_name(self, option)
 
     def update_attrs(self):
         """Update the entity's attributes."""
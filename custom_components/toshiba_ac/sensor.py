@@ -1,45 +1,177 @@
 """Platform for sensor integration."""
 from __future__ import annotations
 
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
 from datetime import date, datetime
 import logging
+import time
+from typing import Any
 
-from toshiba_ac.device import ToshibaAcDevice, ToshibaAcDeviceEnergyConsumption
+from toshiba_ac.device import (
+    ToshibaAcDevice,
+    ToshibaAcDeviceEnergyConsumption,
+    ToshibaAcMode,
+    ToshibaAcStatus,
+)
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import UnitOfEnergy, UnitOfTemperature
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy, UnitOfPower, UnitOfTemperature, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import StateType
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import (
+    CONF_FLEET_SENSORS,
+    DOMAIN,
+    ENERGY_REPORT_INTERVAL,
+    SIGNAL_DEVICES_ADDED,
+    SIGNAL_DEVICES_REMOVED,
+)
 from .entity import ToshibaAcEntity, ToshibaAcStateEntity
+from .fleet import ToshibaAcFleetAggregator, ToshibaAcRunningStats
+from .history import ToshibaAcTemperatureHistory
+from .power import ToshibaAcPowerEstimator
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _temperature_attributes(stats: ToshibaAcRunningStats) -> dict[str, Any]:
+    """Return min and max of temperature stats as state attributes."""
+    return {"min": stats.min, "max": stats.max}
+
+
+@dataclass(kw_only=True)
+class ToshibaAcFleetSensorDescription(SensorEntityDescription):
+    """Describe a sensor aggregating all Toshiba AC devices of an entry."""
+
+    value_fn: Callable[[ToshibaAcFleetAggregator], StateType]
+    attributes_fn: Callable[
+        [ToshibaAcFleetAggregator], dict[str, Any]
+    ] = lambda _aggregator: {}
+    # Restores the aggregator from the attributes of the last state
+    restore_fn: Callable[
+        [ToshibaAcFleetAggregator, Mapping[str, Any]], None
+    ] | None = None
+
+
+_FLEET_SENSOR_DESCRIPTIONS: Sequence[ToshibaAcFleetSensorDescription] = [
+    ToshibaAcFleetSensorDescription(
+        key="fleet_energy",
+        translation_key="fleet_energy",
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda aggregator: aggregator.energy_wh,
+        attributes_fn=lambda aggregator: {
+            "departed_units_wh": dict(aggregator.departed_energy_wh)
+        },
+        restore_fn=lambda aggregator, attributes: aggregator.restore_departed(
+            attributes.get("departed_units_wh") or {}
+        ),
+    ),
+    ToshibaAcFleetSensorDescription(
+        key="fleet_running_units",
+        translation_key="fleet_running_units",
+        icon="mdi:air-conditioner",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregator: aggregator.running_units.total(),
+        attributes_fn=lambda aggregator: {
+            mode.name.lower(): aggregator.running_units[mode.name.lower()]
+            for mode in ToshibaAcMode
+            if mode != ToshibaAcMode.NONE
+        },
+    ),
+    ToshibaAcFleetSensorDescription(
+        key="fleet_indoor_temperature",
+        translation_key="fleet_indoor_temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregator: aggregator.indoor_temperature.mean,
+        attributes_fn=lambda aggregator: _temperature_attributes(
+            aggregator.indoor_temperature
+        ),
+    ),
+    ToshibaAcFleetSensorDescription(
+        key="fleet_outdoor_temperature",
+        translation_key="fleet_outdoor_temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregator: aggregator.outdoor_temperature.mean,
+        attributes_fn=lambda aggregator: _temperature_attributes(
+            aggregator.outdoor_temperature
+        ),
+    ),
+]
+
+
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Add sensor entities for passed config_entry in HA."""
     device_manager = hass.data[DOMAIN][config_entry.entry_id]
-    new_entities = []
-
-    devices: list[ToshibaAcDevice] = await device_manager.get_devices()
-    for device in devices:
-        if device.supported.ac_energy_report:
-            new_entities.append(ToshibaPowerSensor(device))
-        else:
-            _LOGGER.debug(
-                "AC device %s does not support energy monitoring", device.name
-            )
+    aggregator: ToshibaAcFleetAggregator | None = None
+
+    if config_entry.options.get(CONF_FLEET_SENSORS, False):
+        aggregator = ToshibaAcFleetAggregator()
+        config_entry.async_on_unload(aggregator.remove_all)
+        async_add_devices(
+            ToshibaAcFleetSensor(config_entry, aggregator, description)
+            for description in _FLEET_SENSOR_DESCRIPTIONS
+        )
+
+    @callback
+    def add_entities(devices: list[ToshibaAcDevice]) -> None:
+        """Add sensor entities for the given devices."""
+        new_entities = []
+        if aggregator is not None:
+            for device in devices:
+                aggregator.add_device(device)
+        for device in devices:
+            if device.supported.ac_energy_report:
+                new_entities.append(ToshibaPowerSensor(device))
+                new_entities.append(ToshibaPowerDrawSensor(device))
+            else:
+                _LOGGER.debug(
+                    "AC device %s does not support energy monitoring", device.name
+                )
+
+            # Outdoor temperature sensor - value may be None when outdoor unit is off
+            new_entities.append(ToshibaTempSensor(device))
+            new_entities.append(ToshibaTimeToTargetSensor(device))
 
-        # Outdoor temperature sensor - value may be None when outdoor unit is off
-        new_entities.append(ToshibaTempSensor(device))
+        if new_entities:
+            _LOGGER.info("Adding %d sensor entities", len(new_entities))
+            async_add_devices(new_entities)
 
-    if new_entities:
-        _LOGGER.info("Adding %d sensor entities", len(new_entities))
-        async_add_devices(new_entities)
+    @callback
+    def remove_devices(devices: list[ToshibaAcDevice]) -> None:
+        """Drop removed devices from the fleet aggregates."""
+        if aggregator is not None:
+            for device in devices:
+                aggregator.remove_device(device)
+
+    add_entities(await device_manager.get_devices())
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{SIGNAL_DEVICES_ADDED}_{config_entry.entry_id}", add_entities
+        )
+    )
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{SIGNAL_DEVICES_REMOVED}_{config_entry.entry_id}", remove_devices
+        )
+    )
 
 
 class ToshibaPowerSensor(ToshibaAcEntity, SensorEntity):
@@ -70,6 +202,7 @@ class ToshibaPowerSensor(ToshibaAcEntity, SensorEntity):
         # The call back registration is done once this entity is registered with HA
         # (rather than in the __init__)
         # self._device.register_callback(self.async_write_ha_state)
+        await super().async_added_to_hass()
         self._device.on_energy_consumption_changed_callback.add(self.state_changed)
 
     async def async_will_remove_from_hass(self):
@@ -93,6 +226,75 @@ class ToshibaPowerSensor(ToshibaAcEntity, SensorEntity):
         return {}
 
 
+class ToshibaPowerDrawSensor(ToshibaAcEntity, SensorEntity):
+    """Average power draw derived from the energy consumption reports.
+
+    The library only reports the energy consumption when it changed. While the
+    next change is overdue, the shown power is lowered accordingly, the power
+    itself is only computed from changes of the counter.
+    """
+
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 0
+    _attr_has_entity_name = True
+
+    def __init__(self, device: ToshibaAcDevice):
+        """Initialize the sensor."""
+        super().__init__(device)
+        self._attr_unique_id = f"{device.ac_unique_id}_power"
+        self._attr_translation_key = "power"
+        self._estimator = ToshibaAcPowerEstimator()
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to energy consumption reports."""
+        await super().async_added_to_hass()
+        self._update_estimate(dt_util.utcnow())
+        self._device.on_energy_consumption_changed_callback.add(
+            self._energy_consumption_changed
+        )
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._check_overdue, ENERGY_REPORT_INTERVAL
+            )
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unsubscribe from energy consumption reports."""
+        self._device.on_energy_consumption_changed_callback.remove(
+            self._energy_consumption_changed
+        )
+
+    def _energy_consumption_changed(self, _device: ToshibaAcDevice) -> None:
+        """Update the power from a new energy consumption report."""
+        self._update_estimate(dt_util.utcnow())
+        self.async_write_ha_state()
+
+    @callback
+    def _check_overdue(self, now: datetime) -> None:
+        """Lower the shown power while the next counter change is overdue."""
+        native_value = self._native_value(now)
+        if native_value != self._attr_native_value:
+            self._attr_native_value = native_value
+            self.async_write_ha_state()
+
+    def _update_estimate(self, now: datetime) -> None:
+        """Feed the current energy consumption of the device to the estimator."""
+        if (consumption := self._device.ac_energy_consumption) is None:
+            return
+        self._estimator.update(
+            consumption.energy_wh, consumption.since, now.timestamp()
+        )
+        self._attr_native_value = self._native_value(now)
+
+    def _native_value(self, now: datetime) -> float | None:
+        """Return the power to show at now."""
+        if (power_w := self._estimator.power_at(now.timestamp())) is None:
+            return None
+        return max(power_w, 0.0)
+
+
 class ToshibaTempSensor(ToshibaAcStateEntity, SensorEntity):
     """Provides a Toshiba Temperature Sensors."""
 
@@ -118,3 +320,88 @@ class ToshibaTempSensor(ToshibaAcStateEntity, SensorEntity):
     def native_value(self) -> int | None:
         """Return the value reported by the sensor."""
         return self._device.ac_outdoor_temperature
+
+
+class ToshibaTimeToTargetSensor(ToshibaAcStateEntity, SensorEntity):
+    """Estimated minutes until the indoor temperature reaches the target."""
+
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_suggested_display_precision = 0
+    _attr_has_entity_name = True
+
+    def __init__(self, device: ToshibaAcDevice):
+        """Initialize the sensor."""
+        super().__init__(device)
+        self._attr_unique_id = f"{device.ac_unique_id}_time_to_target"
+        self._attr_translation_key = "time_to_target"
+        self._history = ToshibaAcTemperatureHistory()
+        self.update_attrs()
+
+    def update_attrs(self) -> None:
+        """Record a sample and update the estimate."""
+        now = time.monotonic()
+        self._history.add(
+            now,
+            self._device.ac_indoor_temperature,
+            self._device.ac_temperature,
+            self._device.ac_mode
+            if self._device.ac_status == ToshibaAcStatus.ON
+            else ToshibaAcMode.NONE,
+        )
+        seconds = self._history.seconds_to_target(now)
+        self._attr_native_value = None if seconds is None else seconds / 60
+        rate = self._history.rate(now)
+        self._attr_extra_state_attributes = {
+            "rate_per_hour": None if rate is None else round(rate * 3600, 2)
+        }
+
+
+class ToshibaAcFleetSensor(SensorEntity, RestoreEntity):
+    """Sensor for an aggregate over all Toshiba AC devices of a config entry."""
+
+    entity_description: ToshibaAcFleetSensorDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        config_entry: ConfigEntry,
+        aggregator: ToshibaAcFleetAggregator,
+        entity_description: ToshibaAcFleetSensorDescription,
+    ) -> None:
+        """Initialize the fleet sensor."""
+        self.entity_description = entity_description
+        self._aggregator = aggregator
+        self._attr_unique_id = f"{config_entry.entry_id}_{entity_description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            manufacturer="Toshiba",
+            name=f"Toshiba AC {config_entry.title}",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+        self.update_attrs()
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to aggregate changes."""
+        self.async_on_remove(self._aggregator.add_listener(self._aggregates_changed))
+        if self.entity_description.restore_fn is not None and (
+            last_state := await self.async_get_last_state()
+        ):
+            self.entity_description.restore_fn(self._aggregator, last_state.attributes)
+            self.update_attrs()
+
+    def update_attrs(self) -> None:
+        """Update the state from the aggregates."""
+        self._attr_native_value = self.entity_description.value_fn(self._aggregator)
+        self._attr_extra_state_attributes = self.entity_description.attributes_fn(
+            self._aggregator
+        )
+
+    @callback
+    def _aggregates_changed(self) -> None:
+        """Write the state if the aggregate of this sensor changed."""
+        old_state = (self._attr_native_value, self._attr_extra_state_attributes)
+        self.update_attrs()
+        if old_state != (self._attr_native_value, self._attr_extra_state_attributes):
+            self.async_write_ha_state()
@@ -20,10 +20,13 @@ from homeassistant.components.switch import (
     SwitchEntity,
     SwitchEntityDescription,
 )
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .const import DOMAIN
-from .entity import ToshibaAcStateEntity
+from .const import DOMAIN, SIGNAL_DEVICES_ADDED
+from .entity import ToshibaAcEntity, ToshibaAcStateEntity
 from .entity_description import ToshibaAcEnumEntityDescriptionMixin
+from .tracing import traced
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,10 +38,10 @@ class ToshibaAcSwitchDescription(SwitchEntityDescription):
     device_class = SwitchDeviceClass.SWITCH
     off_icon: str | None = None
 
-    async def async_turn_on(self, _device: ToshibaAcDevice):
+    async def async_turn_on(self, _entity: ToshibaAcEntity):
         """Turn the switch on."""
 
-    async def async_turn_off(self, _device: ToshibaAcDevice):
+    async def async_turn_off(self, _entity: ToshibaAcEntity):
         """Turn the switch off."""
 
     def is_on(self, _device: ToshibaAcDevice):
@@ -71,13 +74,13 @@ class ToshibaAcEnumSwitchDescription(
     ac_attr_name: str = ""
     ac_attr_setter: str = ""
 
-    async def async_turn_off(self, device: ToshibaAcDevice):
+    async def async_turn_off(self, entity: ToshibaAcEntity):
         """Turn the switch off."""
-        await self.async_set_attr(device, self.ac_off_value)
+        await self.async_set_attr(entity, self.ac_off_value)
 
-    async def async_turn_on(self, device: ToshibaAcDevice):
+    async def async_turn_on(self, entity: ToshibaAcEntity):
         """Turn the switch on."""
-        await self.async_set_attr(device, self.ac_on_value)
+        await self.async_set_attr(entity, self.ac_on_value)
 
     def is_on(self, device: ToshibaAcDevice):
         """Return True if the switch is on."""
@@ -128,23 +131,34 @@ _SWITCH_DESCRIPTIONS: Sequence[ToshibaAcSwitchDescription] = [
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Add switch entities for passed config_entry in HA."""
     device_manager = hass.data[DOMAIN][config_entry.entry_id]
-    new_entities = []
 
-    devices: list[ToshibaAcDevice] = await device_manager.get_devices()
-    for device in devices:
-        for entity_description in _SWITCH_DESCRIPTIONS:
-            if entity_description.is_supported(device.supported):
-                new_entities.append(ToshibaAcSwitchEntity(device, entity_description))
-            else:
-                _LOGGER.debug(
-                    "AC device %s does not support %s",
-                    device.name,
-                    entity_description.key,
-                )
-
-    if new_entities:
-        _LOGGER.info("Adding %d switch entities", len(new_entities))
-        async_add_devices(new_entities)
+    @callback
+    def add_entities(devices: list[ToshibaAcDevice]) -> None:
+        """Add switch entities for the given devices."""
+        new_entities = []
+        for device in devices:
+            for entity_description in _SWITCH_DESCRIPTIONS:
+                if entity_description.is_supported(device.supported):
+                    new_entities.append(
+                        ToshibaAcSwitchEntity(device, entity_description)
+                    )
+                else:
+                    _LOGGER.debug(
+                        "AC device %s does not support %s",
+                        device.name,
+                        entity_description.key,
+                    )
+
+        if new_entities:
+            _LOGGER.info("Adding %d switch entities", len(new_entities))
+            async_add_devices(new_entities)
+
+    add_entities(await device_manager.get_devices())
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{SIGNAL_DEVICES_ADDED}_{config_entry.entry_id}", add_entities
+        )
+    )
 
 
 class ToshibaAcSwitchEntity(ToshibaAcStateEntity, SwitchEntity):
@@ -186,10 +200,12 @@ class ToshibaAcSwitchEntity(ToshibaAcStateEntity, SwitchEntity):
         """Return True if the switch is on."""
         return self.entity_description.is_on(self._device)
 
+    @traced
     async def async_turn_off(self, **kwargs: Any):
         """Turn the switch off."""
-        await self.entity_description.async_turn_off(self._device)
+        await self.entity_description.async_turn_off(self)
 
+    @traced
     async def async_turn_on(self, **kwargs: Any):
         """Turn the switch on."""
-        await self.entity_description.async_turn_on(self._device)
+        await self.entity_description.async_turn_on(self)
@@ -0,0 +1,273 @@
+"""Trace commands from the service call to the push confirming them."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from functools import wraps
+import json
+import logging
+import os
+import random
+import time
+from typing import TYPE_CHECKING, Any, Concatenate, ParamSpec, TypeVar
+import uuid
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    TRACE_CONFIRM_TIMEOUT,
+    TRACE_FILE_BACKUPS,
+    TRACE_FILE_MAX_BYTES,
+    TRACE_FLUSH_DELAY,
+    TRACE_MAX_PENDING,
+)
+
+if TYPE_CHECKING:
+    from toshiba_ac.device import ToshibaAcDevice
+
+    from .entity import ToshibaAcEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+_EntityT = TypeVar("_EntityT", bound="ToshibaAcEntity")
+
+_current_trace: ContextVar[ToshibaAcTrace | None] = ContextVar(
+    "toshiba_ac_trace", default=None
+)
+
+
+def current_trace() -> ToshibaAcTrace | None:
+    """Return the trace of the command being handled, if it is sampled."""
+    return _current_trace.get()
+
+
+class ToshibaAcTraceWriter:
+    """Append trace records to a rotating JSONL file from the executor.
+
+    Records are collected on the event loop and written in batches, so tracing
+    never blocks the loop on file I/O.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize the writer."""
+        self.hass = hass
+        self.path = path
+        self._records: list[dict[str, Any]] = []
+        self._flush_handle: Any = None
+
+    @callback
+    def add(self, record: dict[str, Any]) -> None:
+        """Queue a record and schedule writing it."""
+        self._records.append(record)
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(
+                TRACE_FLUSH_DELAY, self._schedule_flush
+            )
+
+    @callback
+    def _schedule_flush(self) -> None:
+        """Write the queued records in the background."""
+        self._flush_handle = None
+        self.hass.async_create_background_task(
+            self.async_flush(), "toshiba_ac trace flush"
+        )
+
+    async def async_flush(self) -> None:
+        """Write all queued records."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._records:
+            return
+        lines = "".join(
+            json.dumps(record, separators=(",", ":"), default=str) + "\n"
+            for record in self._records
+        )
+        self._records = []
+        try:
+            await self.hass.async_add_executor_job(self._write, lines)
+        except OSError as ex:
+            _LOGGER.warning("Writing command traces to %s failed: %s", self.path, ex)
+
+    def _write(self, lines: str) -> None:
+        """Append lines to the trace file, rotating it when it is full."""
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            size = 0
+        if size and size + len(lines) > TRACE_FILE_MAX_BYTES:
+            for i in range(TRACE_FILE_BACKUPS - 1, 0, -1):
+                if os.path.exists(f"{self.path}.{i}"):
+                    os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        with open(self.path, "a", encoding="utf-8") as trace_file:
+            trace_file.write(lines)
+
+
+class ToshibaAcTrace:
+    """A sampled command with its trace id."""
+
+    __slots__ = ("trace_id", "device_name", "context_id", "writer")
+
+    def __init__(
+        self,
+        device_name: str,
+        context_id: str | None,
+        writer: ToshibaAcTraceWriter,
+    ) -> None:
+        """Start a trace."""
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.device_name = device_name
+        self.context_id = context_id
+        self.writer = writer
+
+    @callback
+    def span(self, name: str, start: float, end: float, **data: Any) -> None:
+        """Record a span of the trace, start and end are POSIX timestamps."""
+        self.writer.add(
+            {
+                "trace_id": self.trace_id,
+                "span": name,
+                "device": self.device_name,
+                "context_id": self.context_id,
+                "start": round(start, 6),
+                "duration_ms": round((end - start) * 1000, 3),
+                **data,
+            }
+        )
+
+
+class _PendingConfirmation:
+    """A sent value waiting for the push that reports it."""
+
+    __slots__ = ("trace", "attr", "value", "sent", "cancel_timeout")
+
+    def __init__(self, trace: ToshibaAcTrace, attr: str, value: Any) -> None:
+        """Initialize a pending confirmation."""
+        self.trace = trace
+        self.attr = attr
+        self.value = value
+        self.sent = time.time()
+        self.cancel_timeout: CALLBACK_TYPE | None = None
+
+    @callback
+    def close(self, reason: str | None = None) -> None:
+        """Write the confirm span, unconfirmed if a reason is given."""
+        if self.cancel_timeout is not None:
+            self.cancel_timeout()
+            self.cancel_timeout = None
+        data: dict[str, Any] = {"attribute": self.attr, "confirmed": reason is None}
+        if reason is not None:
+            data["reason"] = reason
+        self.trace.span("confirm", self.sent, time.time(), **data)
+
+
+class ToshibaAcTracer:
+    """Sample commands of the devices of a config entry and trace them.
+
+    A trace ends with a span for the first state push in which the device reports
+    the value that was sent. Without such a push it ends unconfirmed after
+    TRACE_CONFIRM_TIMEOUT, when more than TRACE_MAX_PENDING commands of the
+    device are waiting, or when the device is removed.
+    """
+
+    def __init__(self, writer: ToshibaAcTraceWriter, sample_rate: float) -> None:
+        """Initialize the tracer."""
+        self.writer = writer
+        self.sample_rate = sample_rate
+        self._devices: dict[str, ToshibaAcDevice] = {}
+        self._pending: dict[str, deque[_PendingConfirmation]] = {}
+
+    def start(
+        self, device: ToshibaAcDevice, context_id: str | None
+    ) -> ToshibaAcTrace | None:
+        """Start a trace for a command, None if it is not sampled."""
+        if random.random() >= self.sample_rate:
+            return None
+        return ToshibaAcTrace(device.name, context_id, self.writer)
+
+    def add_device(self, device: ToshibaAcDevice) -> None:
+        """Watch the state pushes of a device for confirmations."""
+        if device.ac_unique_id in self._devices:
+            return
+        self._devices[device.ac_unique_id] = device
+        self._pending[device.ac_unique_id] = deque()
+        device.on_state_changed_callback.add(self._state_changed)
+
+    def remove_device(self, device: ToshibaAcDevice) -> None:
+        """Stop watching a device."""
+        if self._devices.pop(device.ac_unique_id, None) is None:
+            return
+        device.on_state_changed_callback.remove(self._state_changed)
+        for confirmation in self._pending.pop(device.ac_unique_id):
+            confirmation.close("removed")
+
+    def remove_all(self) -> None:
+        """Stop watching all devices."""
+        for device in list(self._devices.values()):
+            self.remove_device(device)
+
+    @callback
+    def await_confirmation(
+        self, trace: ToshibaAcTrace, device: ToshibaAcDevice, setter: str, value: Any
+    ) -> None:
+        """Wait for the push that reports value for the attribute of setter."""
+        if (pending := self._pending.get(device.ac_unique_id)) is None:
+            return
+        if len(pending) >= TRACE_MAX_PENDING:
+            pending.popleft().close("evicted")
+        confirmation = _PendingConfirmation(trace, setter.removeprefix("set_"), value)
+
+        @callback
+        def timed_out(_now: Any) -> None:
+            confirmation.cancel_timeout = None
+            pending.remove(confirmation)
+            confirmation.close("timeout")
+
+        confirmation.cancel_timeout = async_call_later(
+            self.writer.hass, TRACE_CONFIRM_TIMEOUT, timed_out
+        )
+        pending.append(confirmation)
+
+    def _state_changed(self, device: ToshibaAcDevice) -> None:
+        """Close the traces confirmed by this push."""
+        if not (pending := self._pending.get(device.ac_unique_id)):
+            return
+        waiting = []
+        for confirmation in pending:
+            if getattr(device, confirmation.attr, None) == confirmation.value:
+                confirmation.close()
+            else:
+                waiting.append(confirmation)
+        pending.clear()
+        pending.extend(waiting)
+
+
+def traced(
+    func: Callable[Concatenate[_EntityT, _P], Awaitable[_R]],
+) -> Callable[Concatenate[_EntityT, _P], Awaitable[_R]]:
+    """Trace a command method of an entity, called by a service."""
+
+    @wraps(func)
+    async def wrapper(self: _EntityT, *args: _P.args, **kwargs: _P.kwargs) -> _R:
+        tracer = self.tracer
+        if tracer is None or _current_trace.get() is not None:
+            return await func(self, *args, **kwargs)
+        context_id = self._context.id if self._context else None
+        if (trace := tracer.start(self.device, context_id)) is None:
+            return await func(self, *args, **kwargs)
+
+        token = _current_trace.set(trace)
+        start = time.time()
+        try:
+            return await func(self, *args, **kwargs)
+        finally:
+            trace.span("service", start, time.time(), method=func.__name__)
+            _current_trace.reset(token)
+
+    return wrapper
@@ -0,0 +1,232 @@
+"""Detect a silently stalled push connection to the Toshiba cloud."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    WATCHDOG_CHECK_INTERVAL,
+    WATCHDOG_MIN_SAMPLES,
+    WATCHDOG_MIN_SILENCE,
+    WATCHDOG_PROBE_INTERVAL,
+    WATCHDOG_PROBE_TIMEOUT,
+    WATCHDOG_RECONNECT_BACKOFF,
+    WATCHDOG_SILENCE_FACTOR,
+    ToshibaAcConnectionState,
+)
+
+if TYPE_CHECKING:
+    from .device_manager import ToshibaAcHassDeviceManager
+
+_LOGGER = logging.getLogger(__name__)
+
+# Messages closer together than this are a burst, not the regular cadence
+_BURST_INTERVAL = 1.0
+_SMOOTHING = 0.2
+
+
+class ToshibaAcPushCadence:
+    """Learned interval between push messages of a single device."""
+
+    __slots__ = ("interval", "last_seen", "samples")
+
+    def __init__(self, timestamp: float) -> None:
+        """Initialize the cadence with the first message."""
+        self.interval: float | None = None
+        self.last_seen = timestamp
+        self.samples = 0
+
+    def message_received(self, timestamp: float) -> None:
+        """Update the cadence with a message received at timestamp."""
+        elapsed = timestamp - self.last_seen
+        self.last_seen = timestamp
+        if elapsed < _BURST_INTERVAL:
+            return
+        if self.interval is None:
+            self.interval = elapsed
+        else:
+            self.interval += _SMOOTHING * (elapsed - self.interval)
+        self.samples += 1
+
+    @property
+    def silence_threshold(self) -> float | None:
+        """Return how long the device may be silent, None while still learning."""
+        if self.interval is None or self.samples < WATCHDOG_MIN_SAMPLES:
+            return None
+        return max(
+            WATCHDOG_MIN_SILENCE.total_seconds(),
+            WATCHDOG_SILENCE_FACTOR * self.interval,
+        )
+
+
+@dataclass
+class ToshibaAcWatchdogStats:
+    """Watchdog counters of a config entry, kept across reloads."""
+
+    stalls_detected: int = 0
+    probes: int = 0
+    probe_failures: int = 0
+    reconnects: int = 0
+    recovered_after_reconnect: int = 0
+    resumed_without_reconnect: int = 0
+    last_detected: datetime | None = None
+    last_silence: float | None = None
+    last_recovery_time: float | None = None
+    # Monotonic timestamps, only meaningful within this process
+    stall_started: float | None = None
+    stall_detected: float | None = None
+    last_reconnect: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "stalls_detected": self.stalls_detected,
+            "probes": self.probes,
+            "probe_failures": self.probe_failures,
+            "reconnects": self.reconnects,
+            "recovered_after_reconnect": self.recovered_after_reconnect,
+            "resumed_without_reconnect": self.resumed_without_reconnect,
+            "last_detected": self.last_detected,
+            "last_silence_s": None
+            if self.last_silence is None
+            else round(self.last_silence),
+            "last_recovery_time_s": None
+            if self.last_recovery_time is None
+            else round(self.last_recovery_time),
+        }
+
+
+class ToshibaAcPushWatchdog:
+    """Watch the push messages of a device manager and recover a stalled link.
+
+    The link counts as stalled when every device with a learned cadence has been
+    silent for longer than its threshold, a single silent unit is more likely
+    switched off at the mains. A stall is probed with a round trip over the push
+    connection itself. Only if that fails is the config entry reloaded, which
+    reconnects only this device manager. If the round trip succeeds, the units
+    are just quiet, and the link is probed again after WATCHDOG_PROBE_INTERVAL
+    while the silence lasts.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        device_manager: ToshibaAcHassDeviceManager,
+        stats: ToshibaAcWatchdogStats,
+    ) -> None:
+        """Initialize the watchdog."""
+        self.hass = hass
+        self.entry = entry
+        self.device_manager = device_manager
+        self.stats = stats
+        self._probed_at: float | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start checking periodically, return a function to stop."""
+        return async_track_time_interval(
+            self.hass,
+            self._async_check,
+            WATCHDOG_CHECK_INTERVAL,
+            name=f"{DOMAIN} push watchdog",
+        )
+
+    def _link_silence(self, now: float) -> float | None:
+        """Return for how long the link is silent if it counts as stalled."""
+        silences = []
+        for cadence in self.device_manager.push_cadence.values():
+            if (threshold := cadence.silence_threshold) is None:
+                continue
+            silence = now - cadence.last_seen
+            if silence <= threshold:
+                return None
+            silences.append(silence)
+        return min(silences) if silences else None
+
+    async def _async_check(self, _now: datetime) -> None:
+        """Check the push messages and escalate if the link is stalled."""
+        if self.device_manager.connection_state != ToshibaAcConnectionState.CONNECTED:
+            # The SDK knows that the link is down and is handling it
+            self._probed_at = None
+            return
+
+        now = time.monotonic()
+        if (silence := self._link_silence(now)) is None:
+            self._async_check_recovered(now)
+            return
+
+        if self.stats.stall_detected is None:
+            self.stats.stalls_detected += 1
+            self.stats.last_detected = dt_util.utcnow()
+            self.stats.last_silence = silence
+            self.stats.stall_started = now - silence
+            self.stats.stall_detected = now
+            _LOGGER.warning(
+                "No push messages for %d seconds, probing the push connection",
+                silence,
+            )
+        elif (
+            self._probed_at is not None
+            and now - self._probed_at < WATCHDOG_PROBE_INTERVAL.total_seconds()
+        ):
+            return
+
+        self._probed_at = now
+        self.stats.probes += 1
+        try:
+            await self.device_manager.async_probe_push_link(WATCHDOG_PROBE_TIMEOUT)
+        except Exception as ex:  # pylint: disable=broad-except
+            self.stats.probe_failures += 1
+            _LOGGER.warning("Push connection does not respond: %r", ex)
+        else:
+            _LOGGER.info("Push connection responds, the units are just quiet")
+            return
+
+        if (
+            self.stats.last_reconnect is not None
+            and now - self.stats.last_reconnect
+            < WATCHDOG_RECONNECT_BACKOFF.total_seconds()
+        ):
+            return
+        _LOGGER.warning("Reconnecting the stalled push connection")
+        self.stats.reconnects += 1
+        self.stats.last_reconnect = now
+        self.hass.config_entries.async_schedule_reload(self.entry.entry_id)
+
+    @callback
+    def _async_check_recovered(self, now: float) -> None:
+        """Count a recovery once messages flow again after a stall."""
+        if self.stats.stall_started is None or self.stats.stall_detected is None:
+            return
+        if not any(
+            cadence.last_seen > self.stats.stall_detected
+            for cadence in self.device_manager.push_cadence.values()
+        ):
+            return
+
+        if (
+            self.stats.last_reconnect is not None
+            and self.stats.last_reconnect >= self.stats.stall_detected
+        ):
+            self.stats.recovered_after_reconnect += 1
+        else:
+            self.stats.resumed_without_reconnect += 1
+        self.stats.last_recovery_time = now - self.stats.stall_started
+        _LOGGER.info(
+            "Push messages are flowing again after %d seconds",
+            self.stats.last_recovery_time,
+        )
+        self.stats.stall_started = None
+        self.stats.stall_detected = None
+        self._probed_at = None
@@ -0,0 +1,110 @@
+"""WebSocket API for a compact snapshot of all Toshiba AC devices."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .changes import DEVICE_FIELDS, SUPPORTED_FIELDS, device_snapshot, device_supported
+from .const import DATA_CHANGE_TRACKERS, DOMAIN, SIGNAL_DEVICE_CHANGED
+
+if TYPE_CHECKING:
+    from toshiba_ac.device import ToshibaAcDevice
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Register the WebSocket commands."""
+    websocket_api.async_register_command(hass, websocket_fleet_snapshot)
+    websocket_api.async_register_command(hass, websocket_subscribe_fleet)
+
+
+@callback
+def _async_device_id(hass: HomeAssistant, device: ToshibaAcDevice) -> str | None:
+    """Return the device registry id of a Toshiba AC device."""
+    device_entry = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, device.ac_unique_id)}
+    )
+    return device_entry.id if device_entry else None
+
+
+@callback
+def _async_fleet_snapshot(hass: HomeAssistant) -> dict[str, Any]:
+    """Return the state of all devices as one list per field."""
+    columns: dict[str, list[Any]] = {
+        "device_id": [],
+        "name": [],
+        "sequence": [],
+        **{field: [] for field in DEVICE_FIELDS},
+    }
+    supported: dict[str, list[Any]] = {
+        field: [] for field in (*SUPPORTED_FIELDS, "ac_energy_report")
+    }
+
+    for entry_id, device_manager in hass.data[DOMAIN].items():
+        change_tracker = hass.data.get(DATA_CHANGE_TRACKERS, {}).get(entry_id)
+        for device in device_manager.devices.values():
+            columns["device_id"].append(_async_device_id(hass, device))
+            columns["name"].append(device.name)
+            columns["sequence"].append(
+                change_tracker.sequence(device) if change_tracker else 0
+            )
+            for field, value in device_snapshot(device).items():
+                columns[field].append(value)
+            for field, value in device_supported(device).items():
+                supported[field].append(value)
+
+    return {**columns, "supported": supported}
+
+
+@websocket_api.websocket_command({vol.Required("type"): "toshiba_ac/fleet_snapshot"})
+@callback
+def websocket_fleet_snapshot(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the state and supported features of all devices."""
+    connection.send_result(msg["id"], _async_fleet_snapshot(hass))
+
+
+@websocket_api.websocket_command({vol.Required("type"): "toshiba_ac/subscribe_fleet"})
+@callback
+def websocket_subscribe_fleet(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send a snapshot of all devices, then only the fields that changed."""
+
+    @callback
+    def device_changed(
+        device: ToshibaAcDevice, sequence: int, changes: dict[str, Any]
+    ) -> None:
+        """Forward the changes of a device."""
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"],
+                {
+                    "device_id": _async_device_id(hass, device),
+                    "sequence": sequence,
+                    "changes": changes,
+                },
+            )
+        )
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_DEVICE_CHANGED, device_changed
+    )
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"], {"snapshot": _async_fleet_snapshot(hass)}
+        )
+    )
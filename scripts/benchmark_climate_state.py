@@ -0,0 +1,91 @@
+"""Measure what a state write of the climate entity costs.
+
+A state write runs update_attrs() for the new device state and then reads what
+Home Assistant builds the state object from: state, state_attributes,
+capability_attributes and extra_state_attributes. The device alternates
+between two parsed states, so every write sees a change without timing the
+parsing of the push message.
+
+The entity runs on a fake unit and a stand-in for hass that only has the unit
+system, so the figures leave out the state machine and the event bus.
+
+Run from the repository root:
+
+    python -m scripts.benchmark_climate_state [--writes 20000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import timeit
+from types import SimpleNamespace
+
+from toshiba_ac.device.fcu_state import ToshibaAcFcuState
+from toshiba_ac.device.properties import ToshibaAcMode
+
+from custom_components.toshiba_ac.climate import ToshibaClimate
+from custom_components.toshiba_ac.device_manager import ToshibaAcHassDeviceManager
+from homeassistant.util.unit_system import METRIC_SYSTEM
+
+from .fakes import fake_device_info, fake_state
+
+STATES = [
+    ToshibaAcFcuState.from_hex_state(fake_state(21, ToshibaAcMode.HEAT)),
+    ToshibaAcFcuState.from_hex_state(fake_state(24, ToshibaAcMode.COOL)),
+]
+
+
+async def async_make_climate() -> ToshibaClimate:
+    """Return a climate entity on a fake unit, the manager needs a loop."""
+    manager = ToshibaAcHassDeviceManager("user", "password", "benchmark")
+    manager.add_cached_devices([fake_device_info(0)])
+    climate = ToshibaClimate(manager.devices["fake-unit-0"])
+    climate.hass = SimpleNamespace(config=SimpleNamespace(units=METRIC_SYSTEM))
+    climate._attr_available = True  # pylint: disable=protected-access
+    return climate
+
+
+def state_write(climate: ToshibaClimate) -> Callable[[], None]:
+    """Return a function doing one state change and write."""
+    device = climate.device
+    index = 0
+
+    def write() -> None:
+        nonlocal index
+        index ^= 1
+        device.fcu_state = STATES[index]
+        climate.update_attrs()
+        _ = (
+            climate.state,
+            climate.state_attributes,
+            climate.capability_attributes,
+            climate.extra_state_attributes,
+        )
+
+    return write
+
+
+def main() -> None:
+    """Time state writes and print the best run."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    best = min(
+        timeit.repeat(
+            state_write(asyncio.run(async_make_climate())),
+            number=args.writes,
+            repeat=args.repeat,
+        )
+    )
+    print(
+        f"{best / args.writes * 1e6:.2f} us per state write "
+        f"(best of {args.repeat} x {args.writes})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Measure what importing the integration costs while no entry is set up.
+
+Every module is imported in a fresh interpreter with -X importtime, after the
+Home Assistant modules that are already loaded when it starts or runs a config
+flow. The cumulative import time of the module is the median of the runs.
+For each module the script also reports whether the Toshiba AC library and
+the Azure IoT SDK were loaded with it:
+
+- the package, loaded by Home Assistant at startup;
+- config_flow, loaded when a flow starts;
+- http_api, loaded by the flow in the import executor while validating the
+  login. It imports the library's device package, and with it the SDK.
+
+Run from the repository root:
+
+    python -m scripts.benchmark_imports [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PACKAGE = "custom_components.toshiba_ac"
+MODULES = [PACKAGE, f"{PACKAGE}.config_flow", f"{PACKAGE}.http_api"]
+
+# Loaded by Home Assistant before it loads the integration or runs a flow
+PRELOADED = [
+    "homeassistant.components.sensor",
+    "homeassistant.config_entries",
+    "homeassistant.core",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.entity",
+    "homeassistant.helpers.selector",
+    "voluptuous",
+]
+
+REPORT = """
+import json, sys
+print(json.dumps({
+    "library": "toshiba_ac" in sys.modules,
+    "sdk": "azure.iot.device" in sys.modules,
+}))
+"""
+
+
+def import_module(module: str) -> tuple[float, dict[str, bool]]:
+    """Import a module in a fresh interpreter, return its time in ms and loads."""
+    parents = [
+        module.rsplit(".", depth)[0] for depth in range(module.count("."), 0, -1)
+    ]
+    code = "\n".join(
+        [f"import {name}" for name in [*PRELOADED, *parents, module]] + [REPORT]
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000, json.loads(result.stdout)
+    raise RuntimeError(f"{module} was not imported by the interpreter")
+
+
+def main() -> None:
+    """Import every module repeatedly and print the median times."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for module in MODULES:
+        runs = [import_module(module) for _ in range(args.repeat)]
+        loaded = runs[-1][1]
+        print(
+            f"{module}: {statistics.median(ms for ms, _ in runs):.1f} ms, "
+            f"library {'loaded' if loaded['library'] else 'not loaded'}, "
+            f"SDK {'loaded' if loaded['sdk'] else 'not loaded'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Compare the push message bridge of the library with the batched one.
+
+The library hands every AMQP message from the SDK thread to the event loop with
+run_coroutine_threadsafe() and waits for the device callbacks. The integration
+merges messages into a mailbox per device and drains them once per wakeup.
+
+Two workloads are fed from a thread standing in for the SDK thread:
+
+- paced: one message at a time, each waiting for its device callback, which
+  gives the message-to-callback latency of a quiet link;
+- burst: all messages back to back, as after a reconnect, until the last state
+  reached the device.
+
+CPU is the process time of all threads, per message sent.
+
+Run from the repository root:
+
+    python -m scripts.benchmark_push_ingestion [--messages 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import statistics
+import threading
+import time
+from typing import Any
+
+from toshiba_ac.device import ToshibaAcDevice
+from toshiba_ac.device_manager import ToshibaAcDeviceManager
+
+from custom_components.toshiba_ac.device_manager import ToshibaAcHassDeviceManager
+
+from .fakes import fake_device_info, fake_state
+
+# Alternating setpoints, so that every message changes the state
+STATES = [{"data": fake_state(temperature)} for temperature in range(17, 27)]
+
+
+def library_bridge(manager: ToshibaAcHassDeviceManager) -> Callable[..., None]:
+    """Return the handler of the library, bypassing the batched bridge."""
+    return lambda *args: ToshibaAcDeviceManager.handle_cmd_fcu_from_ac(manager, *args)
+
+
+def batched_bridge(manager: ToshibaAcHassDeviceManager) -> Callable[..., None]:
+    """Return the handler of the integration."""
+    return manager.handle_cmd_fcu_from_ac
+
+
+async def run(
+    make_handler: Callable[[ToshibaAcHassDeviceManager], Callable[..., None]],
+    messages: int,
+    paced: bool,
+) -> dict[str, Any]:
+    """Feed messages through a bridge, return latency and CPU figures."""
+    manager = ToshibaAcHassDeviceManager("user", "password", "benchmark")
+    manager.add_cached_devices([fake_device_info(0)])
+    device = manager.devices["fake-unit-0"]
+    handler = make_handler(manager)
+    delivered = threading.Event()
+    latencies: list[float] = []
+    sent_at = 0.0
+    callbacks = 0
+    last_state = STATES[(messages - 1) % len(STATES)]["data"]
+
+    def state_changed(_device: ToshibaAcDevice) -> None:
+        nonlocal callbacks
+        callbacks += 1
+        if paced:
+            latencies.append(time.perf_counter() - sent_at)
+            delivered.set()
+        elif device.fcu_state.encode() == last_state:
+            delivered.set()
+
+    device.on_state_changed_callback.add(state_changed)
+
+    def feed() -> None:
+        nonlocal sent_at
+        for index in range(messages):
+            delivered.clear()
+            sent_at = time.perf_counter()
+            handler("fake-unit-0", "", [], STATES[index % len(STATES)], "")
+            if paced:
+                delivered.wait()
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    await asyncio.to_thread(feed)
+    await asyncio.to_thread(delivered.wait)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    result = {
+        "wall_ms": wall * 1000,
+        "cpu_per_message_us": cpu / messages * 1e6,
+        "callbacks": callbacks,
+    }
+    if latencies:
+        latencies.sort()
+        result["latency_median_us"] = statistics.median(latencies) * 1e6
+        result["latency_p99_us"] = latencies[int(len(latencies) * 0.99)] * 1e6
+    return result
+
+
+async def main() -> None:
+    """Run both bridges on both workloads and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(
+        f"{'workload':8} {'bridge':8} {'wall ms':>9} {'CPU/msg us':>11} "
+        f"{'callbacks':>9} {'lat p50 us':>11} {'lat p99 us':>11}"
+    )
+    for paced in (True, False):
+        for name, make_handler in (
+            ("library", library_bridge),
+            ("batched", batched_bridge),
+        ):
+            result = await run(make_handler, args.messages, paced)
+            print(
+                f"{'paced' if paced else 'burst':8} {name:8} "
+                f"{result['wall_ms']:9.1f} {result['cpu_per_message_us']:11.1f} "
+                f"{result['callbacks']:9d} "
+                f"{result.get('latency_median_us', float('nan')):11.1f} "
+                f"{result.get('latency_p99_us', float('nan')):11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
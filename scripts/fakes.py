@@ -0,0 +1,258 @@
+"""Fake Toshiba AC units and cloud APIs for the scripts, they never talk to the cloud."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import patch
+
+from toshiba_ac.device.fcu_state import ToshibaAcFcuState
+from toshiba_ac.device.properties import (
+    ToshibaAcDeviceEnergyConsumption,
+    ToshibaAcMode,
+    ToshibaAcStatus,
+)
+from toshiba_ac.utils.http_api import ToshibaAcDeviceAdditionalInfo, ToshibaAcDeviceInfo
+
+from custom_components import toshiba_ac
+from custom_components.toshiba_ac import device_manager as device_manager_module
+from custom_components.toshiba_ac.const import DOMAIN, ToshibaAcConnectionState
+from custom_components.toshiba_ac.device_manager import ToshibaAcHassDeviceManager
+from homeassistant import config_entries, loader
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    category_registry as cr,
+    device_registry as dr,
+    entity_registry as er,
+    floor_registry as fr,
+    frame,
+    issue_registry as ir,
+    label_registry as lr,
+)
+from homeassistant.setup import async_setup_component
+
+# All modes and energy reports
+MERIT_FEATURE = "0001"
+AC_MODEL_ID = "3"
+CONNECT_TIMEOUT = 10.0
+
+
+def fake_state(temperature: int = 22, mode: ToshibaAcMode = ToshibaAcMode.HEAT) -> str:
+    """Return the hex state of a running unit, as pushed by the cloud."""
+    state = ToshibaAcFcuState()
+    state.ac_status = ToshibaAcStatus.ON
+    state.ac_mode = mode
+    state.ac_temperature = temperature
+    return state.encode()
+
+
+def fake_device_info(index: int) -> dict[str, Any]:
+    """Return the cached info of a unit, as stored by the device manager."""
+    return {
+        "ac_id": f"fake-ac-{index}",
+        "ac_unique_id": f"fake-unit-{index}",
+        "ac_name": f"Fake AC {index}",
+        "initial_ac_state": fake_state(),
+        "firmware_version": "0.0.0",
+        "merit_feature": MERIT_FEATURE,
+        "ac_model_id": AC_MODEL_ID,
+    }
+
+
+def fake_unit_ids(units: int) -> list[str]:
+    """Return the ac_unique_ids of the given number of fake units."""
+    return [fake_device_info(index)["ac_unique_id"] for index in range(units)]
+
+
+class FakeHttpApi:
+    """HTTP API of the Toshiba cloud listing a fixed set of fake units."""
+
+    def __init__(self, ac_unique_ids: list[str]) -> None:
+        """Initialize the API with a fake unit per ac_unique_id."""
+        self.devices_info = [
+            ToshibaAcDeviceInfo(
+                **{**fake_device_info(index), "ac_unique_id": ac_unique_id}
+            )
+            for index, ac_unique_id in enumerate(ac_unique_ids)
+        ]
+        self.energy_wh = 0.0
+
+    async def connect(self) -> None:
+        """Log in."""
+
+    async def register_client(self, device_id: str) -> str:
+        """Return a SAS token."""
+        return "fake-sas-token"
+
+    async def get_devices(self) -> list[ToshibaAcDeviceInfo]:
+        """Return the units of the account."""
+        return self.devices_info
+
+    async def get_device_state(self, ac_id: str) -> str:
+        """Return the state of a unit."""
+        return fake_state()
+
+    async def get_device_additional_info(
+        self, ac_id: str
+    ) -> ToshibaAcDeviceAdditionalInfo:
+        """Return the indoor and outdoor unit info of a unit."""
+        return ToshibaAcDeviceAdditionalInfo(cdu=None, fcu=None)
+
+    async def get_devices_energy_consumption(
+        self, ac_unique_ids: list[str]
+    ) -> dict[str, ToshibaAcDeviceEnergyConsumption]:
+        """Return a counter that goes up by 100 Wh with every fetch."""
+        self.energy_wh += 100
+        since = datetime(datetime.now().year, 1, 1, tzinfo=timezone.utc)
+        return {
+            ac_unique_id: ToshibaAcDeviceEnergyConsumption(self.energy_wh, since)
+            for ac_unique_id in ac_unique_ids
+        }
+
+    async def shutdown(self) -> None:
+        """Close the session."""
+
+
+class FakeIoTHubClient:
+    """IoT Hub client that is always connected."""
+
+    def __init__(self) -> None:
+        """Initialize the client."""
+        self.connected = True
+        self.on_connection_state_change: Callable[[], None] | None = None
+
+    async def get_twin(self) -> dict[str, Any]:
+        """Return the device twin."""
+        return {}
+
+    async def shutdown(self) -> None:
+        """Disconnect."""
+        self.connected = False
+
+
+class FakeAmqpApi:
+    """AMQP API of the Toshiba cloud that accepts every message."""
+
+    def __init__(self) -> None:
+        """Initialize the API."""
+        self.handlers: dict[str, Callable[..., None]] = {}
+        self.device = FakeIoTHubClient()
+        self.sent: list[str] = []
+
+    def register_command_handler(
+        self, command: str, handler: Callable[..., None]
+    ) -> None:
+        """Register the handler of a command from the units."""
+        self.handlers[command] = handler
+
+    async def connect(self) -> None:
+        """Connect."""
+
+    async def send_message(self, message: str) -> None:
+        """Send a command to a unit."""
+        self.sent.append(message)
+
+    async def shutdown(self) -> None:
+        """Shut down the client."""
+        await self.device.shutdown()
+
+
+class FakeDeviceManager(ToshibaAcHassDeviceManager):
+    """Device manager on fake cloud APIs, everything above them is real."""
+
+    ac_unique_ids = fake_unit_ids(3)
+
+    async def connect(self) -> str:
+        """Connect to the fake cloud."""
+        if self.http_api is None:
+            self.http_api = FakeHttpApi(self.ac_unique_ids)
+        if self.amqp_api is None:
+            amqp_api = FakeAmqpApi()
+            amqp_api.register_command_handler(
+                "CMD_FCU_FROM_AC", self.handle_cmd_fcu_from_ac
+            )
+            amqp_api.register_command_handler(
+                "CMD_HEARTBEAT", self.handle_cmd_heartbeat
+            )
+            self.amqp_api = amqp_api  # type: ignore[assignment]
+        return await super().connect()
+
+
+@contextmanager
+def fake_cloud() -> Iterator[None]:
+    """Let config entries set up in the block connect to the fake cloud."""
+    with (
+        patch.object(
+            device_manager_module, "ToshibaAcHassDeviceManager", FakeDeviceManager
+        ),
+        # The fake cloud needs no session, the shared one needs zeroconf
+        patch.object(toshiba_ac, "async_get_clientsession", new=lambda hass: None),
+    ):
+        yield
+
+
+async def async_start_hass(config_dir: str) -> HomeAssistant:
+    """Start a bare Home Assistant with the registries the entry needs."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    frame.async_setup(hass)
+    loader.async_setup(hass)
+    await hass.config.async_set_time_zone("UTC")
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    await ar.async_load(hass)
+    await cr.async_load(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    await fr.async_load(hass)
+    await ir.async_load(hass)
+    await lr.async_load(hass)
+    # The websocket API needs the HTTP server, only its command registry is used
+    hass.config.components.add("websocket_api")
+    hass.set_state(CoreState.running)
+    assert await async_setup_component(hass, DOMAIN, {})
+    return hass
+
+
+async def async_wait_connected(hass: HomeAssistant, entry_id: str) -> None:
+    """Wait until the device manager of the entry is connected."""
+    async with asyncio.timeout(CONNECT_TIMEOUT):
+        while True:
+            manager = hass.data[DOMAIN].get(entry_id)
+            if (
+                manager is not None
+                and manager.connection_state == ToshibaAcConnectionState.CONNECTED
+                and len(manager.devices) == len(FakeDeviceManager.ac_unique_ids)
+            ):
+                return
+            await asyncio.sleep(0.01)
+
+
+async def async_add_fake_entry(
+    hass: HomeAssistant, options: dict[str, Any]
+) -> config_entries.ConfigEntry:
+    """Add a config entry on the fake cloud and wait until it is connected."""
+    entry = config_entries.ConfigEntry(
+        data={
+            "username": "fake",
+            "password": "fake",
+            "device_id": "fake",
+            "sas_token": "fake-sas-token",
+        },
+        discovery_keys={},
+        domain=DOMAIN,
+        minor_version=1,
+        options=options,
+        source=config_entries.SOURCE_USER,
+        subentries_data=None,
+        title="fake",
+        unique_id="fake",
+        version=1,
+    )
+    await hass.config_entries.async_add(entry)
+    await async_wait_connected(hass, entry.entry_id)
+    return entry
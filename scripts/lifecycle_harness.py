@@ -0,0 +1,239 @@
+"""Set up and unload a config entry many times and fail if anything grows.
+
+Runs a Home Assistant instance in a temporary configuration directory with one
+Toshiba AC entry on fake cloud APIs (see fakes.FakeDeviceManager), with all
+options enabled. Every cycle unloads the entry, sets it up again, waits until
+it is connected and feeds a state push to every unit. After each cycle it
+samples:
+
+- the memory allocated by Python (tracemalloc, after a garbage collection),
+- the number of asyncio tasks,
+- the number of event bus listeners and dispatcher connections,
+- the callbacks on the devices of the new device manager,
+- the leaked callbacks and tasks counted by the entry's lifecycle stats,
+- the setup and unload latency.
+
+The first cycles warm up caches and are left out. Afterwards the counts must
+stay flat, the memory must not grow by more than --max-growth-kib per cycle
+(least squares slope) and the latency of the last tenth of the cycles must not
+exceed twice that of the first tenth. The exit code is 1 if a check fails.
+
+Run from the repository root:
+
+    python -m scripts.lifecycle_harness [--cycles 300] [--units 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import gc
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from custom_components.toshiba_ac.const import (
+    CONF_COMMAND_BUFFER,
+    CONF_FLEET_SENSORS,
+    CONF_RECORD_MESSAGES,
+    CONF_TRACE_SAMPLE_RATE,
+    DATA_LIFECYCLE_STATS,
+    DOMAIN,
+)
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import DATA_DISPATCHER
+from homeassistant.helpers.entity_platform import DATA_ENTITY_PLATFORM
+
+from .fakes import (
+    FakeDeviceManager,
+    async_add_fake_entry,
+    async_start_hass,
+    async_wait_connected,
+    fake_cloud,
+    fake_state,
+    fake_unit_ids,
+)
+
+WARMUP_CYCLES = 10
+
+
+@dataclass
+class Sample:
+    """Resources and latency after one cycle."""
+
+    memory: int
+    tasks: int
+    bus_listeners: int
+    dispatcher: int
+    device_callbacks: int
+    leaked: int
+    setup: float
+    unload: float
+
+
+async def async_push_states(hass: HomeAssistant, entry_id: str, cycle: int) -> None:
+    """Feed a state push to every unit from a thread, like the SDK does."""
+    manager = hass.data[DOMAIN][entry_id]
+    payload = {"data": fake_state(temperature=17 + cycle % 10)}
+
+    def push() -> None:
+        for ac_unique_id in manager.devices:
+            manager.handle_cmd_fcu_from_ac(ac_unique_id, "", [], payload, "")
+
+    await asyncio.to_thread(push)
+    await hass.async_block_till_done()
+
+
+def prune_entity_platforms(hass: HomeAssistant) -> None:
+    """Drop the entity platforms of unloaded entries.
+
+    Home Assistant resets the platforms of an unloaded entry but keeps them in
+    DATA_ENTITY_PLATFORM, which would count as growth of the integration.
+    """
+    platforms = hass.data[DATA_ENTITY_PLATFORM][DOMAIN]
+    platforms[:] = [platform for platform in platforms if platform.entities]
+
+
+def sample(
+    hass: HomeAssistant, entry: config_entries.ConfigEntry, setup: float, unload: float
+) -> Sample:
+    """Count what the integration holds after a cycle."""
+    prune_entity_platforms(hass)
+    gc.collect()
+    manager = hass.data[DOMAIN][entry.entry_id]
+    stats = hass.data[DATA_LIFECYCLE_STATS][entry.entry_id]
+    return Sample(
+        memory=tracemalloc.get_traced_memory()[0],
+        tasks=len(asyncio.all_tasks()),
+        bus_listeners=sum(hass.bus.async_listeners().values()),
+        dispatcher=sum(len(targets) for targets in hass.data[DATA_DISPATCHER].values()),
+        device_callbacks=sum(
+            len(device.on_state_changed_callback.callbacks)
+            + len(device.on_energy_consumption_changed_callback.callbacks)
+            for device in manager.devices.values()
+        ),
+        leaked=stats.leaked_callbacks + stats.leaked_tasks,
+        setup=setup,
+        unload=unload,
+    )
+
+
+def slope(values: list[float]) -> float:
+    """Return the least squares slope of values over their index."""
+    return statistics.linear_regression(range(len(values)), values).slope
+
+
+def check(samples: list[Sample], max_growth_kib: float) -> list[str]:
+    """Return what grew over the cycles."""
+    failures = []
+    first, last = samples[0], samples[-1]
+    for name in ("tasks", "bus_listeners", "dispatcher", "device_callbacks", "leaked"):
+        if getattr(last, name) > getattr(first, name):
+            failures.append(
+                f"{name} grew from {getattr(first, name)} to {getattr(last, name)}"
+            )
+
+    growth = slope([s.memory for s in samples]) / 1024
+    if growth > max_growth_kib:
+        failures.append(f"memory grows by {growth:.1f} KiB per cycle")
+
+    tenth = max(1, len(samples) // 10)
+    for name in ("setup", "unload"):
+        before = statistics.median(getattr(s, name) for s in samples[:tenth])
+        after = statistics.median(getattr(s, name) for s in samples[-tenth:])
+        if after > 2 * before:
+            failures.append(
+                f"{name} latency grew from {before * 1000:.1f} ms "
+                f"to {after * 1000:.1f} ms"
+            )
+    return failures
+
+
+def report(samples: list[Sample]) -> None:
+    """Print the first and last sample, the memory growth and the latencies."""
+    print(f"{'':16} {'first':>12} {'last':>12}")
+    for name in (
+        "memory",
+        "tasks",
+        "bus_listeners",
+        "dispatcher",
+        "device_callbacks",
+        "leaked",
+    ):
+        print(
+            f"{name:16} {getattr(samples[0], name):>12} "
+            f"{getattr(samples[-1], name):>12}"
+        )
+    print(
+        f"memory growth: {slope([s.memory for s in samples]) / 1024:.2f} KiB per cycle"
+    )
+    for name in ("setup", "unload"):
+        latencies = sorted(getattr(s, name) * 1000 for s in samples)
+        print(
+            f"{name} ms: p50 {statistics.median(latencies):.1f}, "
+            f"p95 {latencies[int(len(latencies) * 0.95)]:.1f}, "
+            f"max {latencies[-1]:.1f}"
+        )
+
+
+async def async_run(cycles: int, config_dir: str) -> list[Sample]:
+    """Run the setup/unload cycles and return the samples after warmup."""
+    hass = await async_start_hass(config_dir)
+    entry = await async_add_fake_entry(
+        hass,
+        {
+            CONF_COMMAND_BUFFER: True,
+            CONF_FLEET_SENSORS: True,
+            CONF_RECORD_MESSAGES: True,
+            CONF_TRACE_SAMPLE_RATE: 100,
+        },
+    )
+
+    samples: list[Sample] = []
+    try:
+        for cycle in range(cycles + WARMUP_CYCLES):
+            started = time.perf_counter()
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+            unload = time.perf_counter() - started
+
+            started = time.perf_counter()
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await async_wait_connected(hass, entry.entry_id)
+            setup = time.perf_counter() - started
+
+            await async_push_states(hass, entry.entry_id, cycle)
+            if cycle >= WARMUP_CYCLES:
+                samples.append(sample(hass, entry, setup, unload))
+    finally:
+        await hass.async_stop(force=True)
+    return samples
+
+
+def main() -> None:
+    """Run the harness and exit with 1 if anything grew."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=300)
+    parser.add_argument("--units", type=int, default=3)
+    parser.add_argument("--max-growth-kib", type=float, default=1.0)
+    args = parser.parse_args()
+
+    FakeDeviceManager.ac_unique_ids = fake_unit_ids(args.units)
+    tracemalloc.start()
+    with tempfile.TemporaryDirectory() as config_dir, fake_cloud():
+        samples = asyncio.run(async_run(args.cycles, config_dir))
+
+    report(samples)
+    if failures := check(samples, args.max_growth_kib):
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print(f"OK: nothing grew over {len(samples)} cycles")
+
+
+if __name__ == "__main__":
+    main()
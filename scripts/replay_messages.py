@@ -0,0 +1,178 @@
+"""Replay a recording of push messages on fake units in Home Assistant.
+
+Recordings are made with the "Record push messages" option. The replay starts
+a bare Home Assistant in a temporary configuration directory with one Toshiba
+AC entry on fake cloud APIs (see fakes.FakeDeviceManager), with fleet sensors
+enabled and a fake unit with the same ac_unique_id for every unit of the
+recording. State updates and heartbeats are fed from a thread standing in for
+the SDK thread, through the same bridge as live pushes, so they run the device
+callbacks, the coalesced state writes of the entities, the change events and
+the fleet aggregates. Energy reports go to the units on the event loop, like
+the periodic fetch does.
+
+The original timing is kept, sped up by --speed, or the messages follow each
+other at once with --speed 0. Then the bridge merges the pushes of a unit into
+one update, and rates derived from the time between reports, like the power,
+are meaningless. At the end the statistics of the bridge, the
+change events and state writes of every unit and the final state of every
+entity are printed.
+
+Run from the repository root:
+
+    python -m scripts.replay_messages toshiba_ac_messages.jsonl.gz [--speed 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from datetime import datetime
+import json
+import tempfile
+import time
+from typing import Any
+
+from toshiba_ac.device import ToshibaAcDevice
+from toshiba_ac.device.properties import ToshibaAcDeviceEnergyConsumption
+
+from custom_components.toshiba_ac.const import (
+    CONF_FLEET_SENSORS,
+    DATA_STATE_WRITE_STATS,
+    DOMAIN,
+    SIGNAL_DEVICE_CHANGED,
+    STATE_WRITE_COALESCE_DELAY,
+)
+from custom_components.toshiba_ac.device_manager import (
+    CMD_FCU_FROM_AC,
+    CMD_HEARTBEAT,
+    ToshibaAcHassDeviceManager,
+)
+from custom_components.toshiba_ac.message_log import KIND_ENERGY, load_messages
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .fakes import FakeDeviceManager, async_add_fake_entry, async_start_hass, fake_cloud
+
+MESSAGE_KEYS = {"t", "c", "id", "p"}
+
+
+def load_recording(path: str) -> list[dict[str, Any]]:
+    """Load a recording and check that it holds push messages."""
+    messages = load_messages(path)
+    if not all(MESSAGE_KEYS <= message.keys() for message in messages):
+        raise SystemExit(f"{path} is not a recording of push messages")
+    return messages
+
+
+def feed(
+    manager: ToshibaAcHassDeviceManager,
+    messages: list[dict[str, Any]],
+    speed: float,
+    loop: asyncio.AbstractEventLoop,
+) -> None:
+    """Feed the messages like the SDK thread does, run in a thread."""
+    handlers = {
+        CMD_FCU_FROM_AC: manager.handle_cmd_fcu_from_ac,
+        CMD_HEARTBEAT: manager.handle_cmd_heartbeat,
+    }
+    started = time.monotonic()
+    first = messages[0]["t"] if messages else 0.0
+    for message in messages:
+        if speed:
+            time.sleep(
+                max(0.0, started + (message["t"] - first) / speed - time.monotonic())
+            )
+        payload = message["p"]
+        if message["c"] == KIND_ENERGY:
+            device = manager.devices[message["id"]]
+            asyncio.run_coroutine_threadsafe(
+                device.handle_update_ac_energy_consumption(
+                    ToshibaAcDeviceEnergyConsumption(
+                        payload["wh"], datetime.fromisoformat(payload["since"])
+                    )
+                ),
+                loop,
+            ).result()
+        elif (handler := handlers.get(message["c"])) is not None:
+            handler(message["id"], "", [], payload, "")
+
+
+async def async_replay(
+    messages: list[dict[str, Any]], speed: float, config_dir: str
+) -> None:
+    """Replay the messages on an entry of fake units and print what it saw."""
+    hass = await async_start_hass(config_dir)
+    try:
+        entry = await async_add_fake_entry(hass, {CONF_FLEET_SENSORS: True})
+        await hass.async_block_till_done()
+        manager: ToshibaAcHassDeviceManager = hass.data[DOMAIN][entry.entry_id]
+        write_stats: dict[str, Counter[str]] = hass.data[DATA_STATE_WRITE_STATS]
+        writes_before = {
+            ac_unique_id: stats["state_writes"]
+            for ac_unique_id, stats in write_stats.items()
+        }
+        change_events: Counter[str] = Counter()
+
+        @callback
+        def device_changed(
+            device: ToshibaAcDevice, sequence: int, changes: dict[str, Any]
+        ) -> None:
+            """Count the change events of a unit."""
+            change_events[device.ac_unique_id] += 1
+
+        async_dispatcher_connect(hass, SIGNAL_DEVICE_CHANGED, device_changed)
+
+        started = time.perf_counter()
+        await asyncio.to_thread(feed, manager, messages, speed, hass.loop)
+        # Let the bridge deliver what is still pending and the entities write it
+        await asyncio.sleep(0)
+        while manager.drain_task is not None and not manager.drain_task.done():
+            await manager.drain_task
+        await asyncio.sleep(STATE_WRITE_COALESCE_DELAY)
+        await hass.async_block_till_done()
+        wall = time.perf_counter() - started
+
+        print(f"Replayed {len(messages)} messages in {wall:.3f} seconds")
+        print(json.dumps(manager.ingestion_diagnostics, indent=2))
+        for ac_unique_id in manager.devices:
+            writes = write_stats[ac_unique_id]["state_writes"] - writes_before.get(
+                ac_unique_id, 0
+            )
+            print(
+                f"{ac_unique_id}: {change_events[ac_unique_id]} change events, "
+                f"{writes} state writes"
+            )
+        for registry_entry in er.async_entries_for_config_entry(
+            er.async_get(hass), entry.entry_id
+        ):
+            if (state := hass.states.get(registry_entry.entity_id)) is not None:
+                print(f"{state.entity_id}: {state.state}")
+        await hass.config_entries.async_unload(entry.entry_id)
+    finally:
+        await hass.async_stop(force=True)
+
+
+def main() -> None:
+    """Replay a recording and print what the entry saw."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", help="recording, e.g. toshiba_ac_messages.jsonl.gz")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0.0,
+        help="how much faster than recorded, 0 for as fast as possible",
+    )
+    args = parser.parse_args()
+
+    messages = load_recording(args.file)
+    FakeDeviceManager.ac_unique_ids = list(
+        dict.fromkeys(message["id"] for message in messages)
+    )
+    with tempfile.TemporaryDirectory() as config_dir, fake_cloud():
+        asyncio.run(async_replay(messages, args.speed, config_dir))
+
+
+if __name__ == "__main__":
+    main()